@@ -1,23 +1,274 @@
-import os
+import io
+import time
+import asyncio
 import logging
+import functools
+import threading
+import weakref
+import httpx
 import tiktoken
-from typing import Dict, Any, Optional, List
-from litellm import completion
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Collection, FrozenSet, Tuple
+from litellm import completion, acompletion
+from openai import AsyncOpenAI
 from .youtube_services import clean_transcript
+from .settings_services import env_settings
 import re
 
+try:
+    from rs_bpe.bpe import openai as rs_bpe_openai
+except ImportError:  # rs-bpe is an optional accelerator; tiktoken is always available
+    rs_bpe_openai = None
+
 logger = logging.getLogger(__name__)
 
+# Matches the trailing "Keywords: kw1, kw2, ..." line of a synthesis response
+_KEYWORDS_TRAILER_LINE = re.compile(r'^[ \t*_]*Keywords[ \t*_]*:[ \t*_]*(.*?)\s*\Z', re.IGNORECASE | re.MULTILINE)
+
+# Upper bound on per-video summary requests in flight during cluster synthesis
+_MAX_SUMMARY_WORKERS = 10
+
+# Static prompt text is built once at import; calls only join in the variable parts
+_CLEAN_PROMPT_PREFIX = """
+Please clean and improve the following YouTube video transcript. Remove:
+1. Filler words (um, uh, like, you know, etc.)
+2. Sponsorship segments and advertisements
+3. YouTube-specific phrases (like and subscribe, hit the bell, etc.)
+4. Repetitive or redundant content
+5. Non-speech elements in brackets
+
+Keep the core content and maintain readability. Return only the cleaned transcript.
+
+Transcript:
+"""
+
+_SUMMARY_PROMPT_PREFIX = """
+Please provide a comprehensive summary of the following YouTube video transcript.
+
+Video Title: """
+
+_SUMMARY_PROMPT_BODY = """
+
+Please include:
+1. Main topics and key points discussed
+2. Important insights or takeaways
+3. Any actionable advice or recommendations
+4. Overall conclusion or main message
+
+Format the summary in clear, well-structured paragraphs.
+
+Transcript:
+"""
+
+_SYNTHESIS_PROMPT_PREFIX = """
+Create a comprehensive research report based on the following collection of YouTube video summaries.
+
+Research Topic: """
+
+_SYNTHESIS_PROMPT_BODY = """
+
+Please structure your report with the following sections:
+
+1. **Introduction**
+   - Overview of the research topic
+   - Scope and methodology
+
+2. **Key Takeaways**
+   - Main insights from across all videos
+   - Common themes and patterns
+
+3. **Detailed Analysis**
+   - Breakdown of key concepts
+   - Important findings and discoveries
+
+4. **Contradictions and Debates**
+   - Areas where sources disagree
+   - Pro/con arguments if applicable
+   - Different perspectives presented
+
+5. **Actionable Steps**
+   - Practical recommendations
+   - Next steps for further research
+
+6. **Conclusion**
+   - Summary of findings
+   - Final thoughts and implications
+
+Format the output in Markdown with proper headings, bullet points, and emphasis where appropriate.
+Use [[WikiLinks]] format for key concepts to enable knowledge graph linking.
+
+Video Summaries:
+"""
+
+_SYNTHESIS_KEYWORDS_SUFFIX = """
+After the report, add one final line starting with "Keywords:" followed by 10-20
+comma-separated key terms from the report (technical terms, concepts, names of
+people, places or organizations, and important methodologies).
+"""
+
+_KEYWORDS_PROMPT_PREFIX = """
+Extract important concepts, terms, and keywords from the following text that would be valuable as WikiLinks in a knowledge graph.
+Focus on:
+- Technical terms
+- Concepts and theories
+- Names of people, places, or organizations
+- Important ideas or methodologies
+
+Return only a comma-separated list of keywords, without explanations.
+
+Text:
+"""
+
+# Connection pool for provider-native async clients; kept-alive connections skip TCP/TLS setup
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process; encode() is safe to share across threads."""
+    return tiktoken.get_encoding(encoding_name)
+
+
+@functools.lru_cache(maxsize=8)
+def _get_rs_bpe_counter(encoding_name: str) -> Optional[Callable[[str], int]]:
+    """Return rs-bpe's allocation-free count() for the encoding, if installed."""
+    if rs_bpe_openai is None:
+        return None
+    
+    factory = getattr(rs_bpe_openai, encoding_name, None)
+    if factory is None:
+        return None
+    
+    try:
+        return factory().count
+    except Exception as e:
+        logger.warning(f"Could not load rs-bpe encoding {encoding_name}, using tiktoken: {e}")
+        return None
+
+
+def _get_token_counter(encoding_name: str) -> Callable[[str], int]:
+    """Return a function that counts tokens for the given encoding.
+    
+    Prefers rs-bpe when installed and falls back to tiktoken otherwise.
+    """
+    counter = _get_rs_bpe_counter(encoding_name)
+    if counter is not None:
+        return counter
+    
+    encoding = _get_encoding(encoding_name)
+    return lambda text: len(encoding.encode(text))
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_wikilink_pattern(keywords: FrozenSet[str]) -> Tuple[re.Pattern, Dict[str, str]]:
+    """Build the whole-word keyword regex and replacement table for a keyword set.
+    
+    Cached so repeated add_wikilinks calls with the same keywords skip the sort
+    and regex compilation.
+    """
+    # Sort keywords by length (longest first) so the alternation prefers the longest match
+    sorted_keywords = sorted(keywords, key=lambda keyword: (-len(keyword), keyword))
+    replacements = {}
+    for keyword in sorted_keywords:
+        replacements.setdefault(keyword.lower(), f'[[{keyword}]]')
+    
+    # Match every keyword as a whole word in a single pass over the text
+    pattern = re.compile(
+        r'\b(?:' + '|'.join(re.escape(keyword) for keyword in sorted_keywords) + r')\b',
+        re.IGNORECASE
+    )
+    return pattern, replacements
+
+
+class _AsyncRateLimiter:
+    """Token bucket that refills `capacity` units evenly over `period` seconds.
+    
+    A capacity of 0 disables limiting. The bucket outlives event loops, so
+    successive asyncio.run batches share one budget; only the lock that
+    queues waiters is rebuilt for each loop.
+    """
+    
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period if capacity > 0 else 0
+        self._level = float(capacity)
+        self._last = time.monotonic()
+        self._state_lock = threading.Lock()
+        self._loop_locks = weakref.WeakKeyDictionary()
+    
+    async def acquire(self, amount: int = 1) -> None:
+        """Wait until `amount` units are available, then consume them."""
+        if self.capacity <= 0:
+            return
+        
+        # A single request larger than the whole budget would otherwise wait forever
+        amount = min(amount, self.capacity)
+        async with self._loop_lock():
+            while True:
+                wait = self._take(amount)
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+    
+    def _loop_lock(self) -> asyncio.Lock:
+        """Get the lock queueing waiters on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._state_lock:
+            lock = self._loop_locks.get(loop)
+            if lock is None:
+                lock = self._loop_locks[loop] = asyncio.Lock()
+            return lock
+    
+    def _take(self, amount: int) -> float:
+        """Consume `amount` units if available, else return the seconds until they are."""
+        with self._state_lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._last) * self.rate)
+            self._last = now
+            if self._level >= amount:
+                self._level -= amount
+                return 0.0
+            return (amount - self._level) / self.rate
+
 
 class LLMService:
+    # Map model names to encoding
+    _ENCODING_MAP = {
+        'gpt-4': 'cl100k_base',
+        'gpt-3.5-turbo': 'cl100k_base',
+        'claude-3-opus': 'cl100k_base',
+        'claude-3-sonnet': 'cl100k_base',
+        'claude-3-haiku': 'cl100k_base',
+        'llama2': 'cl100k_base',  # Fallback
+    }
+    _DEFAULT_ENCODING = 'cl100k_base'
+    
+    # Above this length, token counts are estimated from samples instead of a full encode
+    _SAMPLING_THRESHOLD = 9000
+    _SAMPLE_COUNT = 30
+    _SAMPLE_SIZE = 300
+    _SAMPLE_TRIM = 3  # samples dropped from each end before averaging
+    _SAMPLE_SAFETY_BUFFER = 1.10
+
     def __init__(self):
-        self.provider = os.getenv('LLM_PROVIDER', 'openai')
-        self.max_cost_limit = float(os.getenv('MAX_COST_LIMIT', '0.10'))
+        env = env_settings()
+        self.provider = env.llm_provider.value
+        self.max_cost_limit = env.max_cost_limit
         
         # Set up API keys
-        self.openai_api_key = os.getenv('OPENAI_API_KEY')
-        self.anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
-        self.ollama_base_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
+        self.openai_api_key = env.openai_api_key
+        self.anthropic_api_key = env.anthropic_api_key
+        self.ollama_base_url = env.ollama_base_url
+        
+        # Limits for concurrent async dispatch (0 disables the RPM/TPM limits)
+        self.max_concurrency = env.llm_max_concurrency
+        self.requests_per_minute = env.llm_rpm
+        self.tokens_per_minute = env.llm_tpm
+        self._request_limiter = _AsyncRateLimiter(self.requests_per_minute)
+        self._token_limiter = _AsyncRateLimiter(self.tokens_per_minute)
+        self._async_loop = None
+        self._async_semaphore = None
+        self._openai_client = None
         
         # Cost per 1K tokens (approximate)
         self.cost_rates = {
@@ -36,6 +287,23 @@ class LLMService:
                 'codellama': 0.0,
             }
         }
+        
+        # Warm the encoding cache so the first request doesn't pay the load cost
+        try:
+            _get_token_counter(self._DEFAULT_ENCODING)
+        except Exception as e:
+            logger.warning(f"Could not preload token encoding: {e}")
+    
+    def apply_settings(self, settings: Any) -> None:
+        """Apply provider, API key and cost settings saved from the settings page."""
+        if settings.openai_api_key != self.openai_api_key:
+            self._discard_openai_client()  # Rebuilt with the new key on next use
+        
+        self.provider = getattr(settings.llm_provider, 'value', settings.llm_provider)
+        self.max_cost_limit = settings.max_cost_limit
+        self.openai_api_key = settings.openai_api_key
+        self.anthropic_api_key = settings.anthropic_api_key
+        self.ollama_base_url = settings.ollama_base_url or 'http://localhost:11434'
     
     def get_model_for_provider(self) -> str:
         """Get the default model for the configured provider."""
@@ -47,39 +315,52 @@ class LLMService:
         return model_map.get(self.provider, 'gpt-3.5-turbo')
     
     def count_tokens(self, text: str, model: str = None) -> int:
-        """Count tokens in text using tiktoken."""
+        """Count tokens in text using rs-bpe if installed, otherwise tiktoken."""
         try:
             if model is None:
                 model = self.get_model_for_provider()
             
-            # Map model names to encoding
-            encoding_map = {
-                'gpt-4': 'cl100k_base',
-                'gpt-3.5-turbo': 'cl100k_base',
-                'claude-3-opus': 'cl100k_base',
-                'claude-3-sonnet': 'cl100k_base',
-                'claude-3-haiku': 'cl100k_base',
-                'llama2': 'cl100k_base',  # Fallback
-            }
-            
-            encoding_name = encoding_map.get(model, 'cl100k_base')
-            encoding = tiktoken.get_encoding(encoding_name)
-            return len(encoding.encode(text))
+            encoding_name = self._ENCODING_MAP.get(model, self._DEFAULT_ENCODING)
+            counter = _get_token_counter(encoding_name)
+            if len(text) > self._SAMPLING_THRESHOLD:
+                return self._estimate_tokens_sampled(text, counter)
+            return counter(text)
         except Exception as e:
             logger.error(f"Error counting tokens: {e}")
             # Fallback: rough estimate (1 token ≈ 4 characters)
             return len(text) // 4
     
+    def _estimate_tokens_sampled(self, text: str, counter: Callable[[str], int]) -> int:
+        """Estimate tokens for long text from equally-spaced samples.
+        
+        Encodes a fixed number of windows, trims the densest and sparsest ones,
+        and scales the mean tokens-per-character by the full length. A safety
+        buffer keeps the result an upper bound for cost checks.
+        """
+        text_length = len(text)
+        half = self._SAMPLE_SIZE // 2
+        start = half
+        stop = text_length - self._SAMPLE_SIZE - half
+        step = (stop - start) / (self._SAMPLE_COUNT - 1)
+        
+        densities = []
+        for i in range(self._SAMPLE_COUNT):
+            offset = int(start + i * step)
+            sample = text[offset:offset + self._SAMPLE_SIZE]
+            densities.append(counter(sample) / len(sample))
+        
+        densities.sort()
+        trimmed = densities[self._SAMPLE_TRIM:-self._SAMPLE_TRIM]
+        mean_density = sum(trimmed) / len(trimmed)
+        return int(mean_density * text_length * self._SAMPLE_SAFETY_BUFFER) + 1
+    
     def estimate_cost(self, text: str, model: str = None) -> Dict[str, Any]:
         """Estimate the cost of processing text with the specified model."""
         if model is None:
             model = self.get_model_for_provider()
         
         token_count = self.count_tokens(text, model)
-        
-        # Get cost rate for the model
-        provider_rates = self.cost_rates.get(self.provider, {})
-        cost_per_1k = provider_rates.get(model, 0.001)  # Default fallback
+        cost_per_1k = self.get_cost_rate(model)
         
         estimated_cost = (token_count / 1000) * cost_per_1k
         
@@ -91,8 +372,35 @@ class LLMService:
             'cost_per_1k_tokens': cost_per_1k
         }
     
+    def get_cost_rate(self, model: str) -> float:
+        """Get the cost per 1K tokens for a model of the configured provider."""
+        provider_rates = self.cost_rates.get(self.provider, {})
+        return provider_rates.get(model, 0.001)  # Default fallback
+    
     def check_cost_limit(self, text: str, model: str = None) -> bool:
-        """Check if the estimated cost is within the limit."""
+        """Check if the estimated cost is within the limit.
+        
+        Length-based bounds decide most inputs without encoding them, which
+        also protects the tokenizer from pathological (e.g. highly repetitive)
+        transcripts that are slow to encode.
+        """
+        if model is None:
+            model = self.get_model_for_provider()
+        
+        cost_per_1k = self.get_cost_rate(model)
+        if cost_per_1k <= 0:
+            return True  # Free local models never exceed the limit
+        
+        max_tokens_allowed = int(self.max_cost_limit / cost_per_1k * 1000)
+        
+        # Every token covers at least one byte, so the byte length is an upper bound
+        if len(text) <= max_tokens_allowed and len(text.encode('utf-8')) <= max_tokens_allowed:
+            return True
+        
+        # Far beyond the limit even at ~4 characters per token
+        if len(text) // 4 > max_tokens_allowed * 2:
+            return False
+        
         estimate = self.estimate_cost(text, model)
         return estimate['estimated_cost'] <= self.max_cost_limit
     
@@ -109,30 +417,43 @@ class LLMService:
             }
         
         try:
-            # Prepare the completion call
-            messages = [{"role": "user", "content": prompt}]
-            
-            # Set up provider-specific parameters
-            if self.provider == 'ollama':
-                response = completion(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    api_base=self.ollama_base_url
-                )
-            else:
-                response = completion(
-                    model=model,
-                    messages=messages,
-                    max_tokens=max_tokens
-                )
+            response = completion(**self._completion_kwargs(prompt, model, max_tokens))
+            return self._format_response(response, model)
             
+        except Exception as e:
+            logger.error(f"Error calling LLM: {e}")
             return {
-                'success': True,
-                'response': response.choices[0].message.content,
-                'usage': response.usage.dict() if response.usage else None,
-                'model': model
+                'success': False,
+                'error': str(e)
             }
+    
+    async def acall_llm(self, prompt: str, model: str = None, max_tokens: int = 2000) -> Dict[str, Any]:
+        """Make a rate-limited async call to the configured LLM provider.
+        
+        Concurrency is capped by LLM_MAX_CONCURRENCY, and requests and tokens are
+        paced by LLM_RPM and LLM_TPM. Tokens are reserved up front from the prompt
+        estimate plus max_tokens, so bursts never overshoot the provider limits.
+        """
+        if model is None:
+            model = self.get_model_for_provider()
+        
+        # Check cost limit
+        if not self.check_cost_limit(prompt, model):
+            return {
+                'success': False,
+                'error': f'Estimated cost exceeds limit of ${self.max_cost_limit}'
+            }
+        
+        try:
+            semaphore, request_limiter, token_limiter = self._get_async_limits()
+            estimated_tokens = self.count_tokens(prompt, model) + max_tokens
+            
+            async with semaphore:
+                await request_limiter.acquire()
+                await token_limiter.acquire(estimated_tokens)
+                response = await self._dispatch_async(prompt, model, max_tokens)
+            
+            return self._format_response(response, model)
             
         except Exception as e:
             logger.error(f"Error calling LLM: {e}")
@@ -141,133 +462,204 @@ class LLMService:
                 'error': str(e)
             }
     
-    def clean_transcript_with_llm(self, transcript: str) -> Dict[str, Any]:
-        """Use LLM to clean and improve transcript quality."""
-        prompt = f"""
-        Please clean and improve the following YouTube video transcript. Remove:
-        1. Filler words (um, uh, like, you know, etc.)
-        2. Sponsorship segments and advertisements
-        3. YouTube-specific phrases (like and subscribe, hit the bell, etc.)
-        4. Repetitive or redundant content
-        5. Non-speech elements in brackets
-        
-        Keep the core content and maintain readability. Return only the cleaned transcript.
-        
-        Transcript:
-        {transcript}
-        """
-        
-        return self.call_llm(prompt, max_tokens=len(transcript.split()) * 2)
+    def _get_async_limits(self):
+        """Get the concurrency semaphore for the running event loop and the shared rate limiters."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            # Pooled connections belong to the loop that opened them
+            self._discard_openai_client()
+            self._async_loop = loop
+            self._async_semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+        return self._async_semaphore, self._request_limiter, self._token_limiter
     
-    def generate_summary(self, transcript: str, video_title: str = "") -> Dict[str, Any]:
-        """Generate a concise summary of the video transcript."""
-        prompt = f"""
-        Please provide a comprehensive summary of the following YouTube video transcript.
-        
-        Video Title: {video_title}
-        
-        Please include:
-        1. Main topics and key points discussed
-        2. Important insights or takeaways
-        3. Any actionable advice or recommendations
-        4. Overall conclusion or main message
-        
-        Format the summary in clear, well-structured paragraphs.
+    async def _dispatch_async(self, prompt: str, model: str, max_tokens: int) -> Any:
+        """Send a completion request, using the pooled native client where available."""
+        if self.provider == 'openai':
+            return await self._get_openai_client().chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens
+            )
+        
+        # Other providers go through litellm
+        return await acompletion(**self._completion_kwargs(prompt, model, max_tokens))
+    
+    def _get_openai_client(self) -> AsyncOpenAI:
+        """Get the OpenAI client for the running event loop, creating it on first use."""
+        if self._openai_client is None:
+            self._openai_client = AsyncOpenAI(
+                api_key=self.openai_api_key,
+                http_client=httpx.AsyncClient(limits=_HTTP_LIMITS, http2=True)
+            )
+        return self._openai_client
+    
+    async def _close_openai_client(self) -> None:
+        """Close the pooled OpenAI client and its connections, if one is open."""
+        client, self._openai_client = self._openai_client, None
+        if client is not None:
+            await client.close()
+    
+    def _discard_openai_client(self) -> None:
+        """Drop the pooled OpenAI client, closing it on its event loop if that loop is still running.
         
-        Transcript:
-        {transcript}
+        Clients are otherwise closed when the asyncio.run batch that opened them
+        ends, so there is nothing left to close once their loop has stopped.
         """
-        
-        return self.call_llm(prompt, max_tokens=1000)
+        client, self._openai_client = self._openai_client, None
+        loop = self._async_loop
+        if client is not None and loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
     
-    def synthesize_cluster_report(self, cluster_name: str, transcripts: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate a comprehensive report from multiple video transcripts."""
-        # Prepare transcript summaries
-        transcript_texts = []
-        for i, transcript_data in enumerate(transcripts, 1):
-            video_id = transcript_data.get('video_id', f'Video {i}')
-            transcript = transcript_data.get('transcript', '')
-            transcript_texts.append(f"Video {i} ({video_id}):\n{transcript}\n")
-        
-        combined_transcripts = "\n".join(transcript_texts)
-        
-        prompt = f"""
-        Create a comprehensive research report based on the following collection of YouTube video transcripts.
-        
-        Research Topic: {cluster_name}
-        Number of Videos: {len(transcripts)}
-        
-        Please structure your report with the following sections:
-        
-        1. **Introduction**
-           - Overview of the research topic
-           - Scope and methodology
-        
-        2. **Key Takeaways**
-           - Main insights from across all videos
-           - Common themes and patterns
+    def _completion_kwargs(self, prompt: str, model: str, max_tokens: int) -> Dict[str, Any]:
+        """Build the litellm completion arguments for the configured provider."""
+        kwargs = {
+            'model': model,
+            'messages': [{"role": "user", "content": prompt}],
+            'max_tokens': max_tokens
+        }
         
-        3. **Detailed Analysis**
-           - Breakdown of key concepts
-           - Important findings and discoveries
+        # Set up provider-specific parameters
+        if self.provider == 'ollama':
+            kwargs['api_base'] = self.ollama_base_url
+        elif self.provider == 'openai' and self.openai_api_key:
+            kwargs['api_key'] = self.openai_api_key
+        elif self.provider == 'anthropic' and self.anthropic_api_key:
+            kwargs['api_key'] = self.anthropic_api_key
         
-        4. **Contradictions and Debates**
-           - Areas where sources disagree
-           - Pro/con arguments if applicable
-           - Different perspectives presented
+        return kwargs
+    
+    def _format_response(self, response: Any, model: str) -> Dict[str, Any]:
+        """Convert a litellm response into the service's result format."""
+        return {
+            'success': True,
+            'response': response.choices[0].message.content,
+            'usage': response.usage.dict() if response.usage else None,
+            'model': model
+        }
+    
+    def clean_transcript_with_llm(self, transcript: str) -> Dict[str, Any]:
+        """Use LLM to clean and improve transcript quality."""
+        prompt = ''.join((_CLEAN_PROMPT_PREFIX, transcript, '\n'))
         
-        5. **Actionable Steps**
-           - Practical recommendations
-           - Next steps for further research
+        return self.call_llm(prompt, max_tokens=len(transcript) // 2)
+    
+    async def aclean_transcript_with_llm(self, transcript: str) -> Dict[str, Any]:
+        """Async variant of clean_transcript_with_llm, paced by the shared rate limits."""
+        prompt = ''.join((_CLEAN_PROMPT_PREFIX, transcript, '\n'))
         
-        6. **Conclusion**
-           - Summary of findings
-           - Final thoughts and implications
+        return await self.acall_llm(prompt, max_tokens=len(transcript) // 2)
+    
+    def clean_transcripts(self, transcripts: List[str]) -> List[Dict[str, Any]]:
+        """Clean several transcripts concurrently, returning results in input order."""
+        async def clean_all():
+            try:
+                return await asyncio.gather(*(self.aclean_transcript_with_llm(t) for t in transcripts))
+            finally:
+                # The client's connections belong to this loop, which asyncio.run closes on return
+                await self._close_openai_client()
+        
+        return asyncio.run(clean_all())
+    
+    def generate_summary(self, transcript: str, video_title: str = "") -> Dict[str, Any]:
+        """Generate a concise summary of the video transcript."""
+        prompt = ''.join((_SUMMARY_PROMPT_PREFIX, video_title, _SUMMARY_PROMPT_BODY, transcript, '\n'))
         
-        Format the output in Markdown with proper headings, bullet points, and emphasis where appropriate.
-        Use [[WikiLinks]] format for key concepts to enable knowledge graph linking.
+        return self.call_llm(prompt, max_tokens=1000)
+    
+    def synthesize_cluster_report(self, cluster_name: str, transcripts: Collection[Tuple[str, str]]) -> Dict[str, Any]:
+        """Generate a comprehensive report from (video_id, transcript) pairs."""
+        return self.call_llm(self._synthesis_prompt(cluster_name, transcripts), max_tokens=3000)
+    
+    def synthesize_with_wikilinks(self, cluster_name: str, transcripts: Collection[Tuple[str, str]]) -> Dict[str, Any]:
+        """Generate a cluster report and its WikiLink keywords with a single LLM call.
         
-        Video Transcripts:
-        {combined_transcripts}
+        On success the response is returned already WikiLinked, with the keywords
+        under 'keywords'. If the model omits the keyword line, they are extracted
+        with a separate call instead.
         """
+        result = self.call_llm(
+            self._synthesis_prompt(cluster_name, transcripts) + _SYNTHESIS_KEYWORDS_SUFFIX,
+            max_tokens=3000
+        )
+        if not result['success']:
+            return result
+        
+        report = result['response']
+        match = _KEYWORDS_TRAILER_LINE.search(report)
+        if match:
+            keywords = self._parse_keywords(match.group(1))
+            report = report[:match.start()].rstrip()
+        else:
+            keywords = self.extract_keywords_for_wikilinks(report)
+        
+        result['response'] = self.add_wikilinks(report, keywords)
+        result['keywords'] = keywords
+        return result
+    
+    def _synthesis_prompt(self, cluster_name: str, transcripts: Collection[Tuple[str, str]]) -> str:
+        """Build the synthesis prompt from per-video summaries of the transcripts."""
+        # Summarize each video concurrently, then synthesize from the much smaller summaries
+        summaries = self._summarize_transcripts(transcripts)
+        
+        # Write the prompt and summaries straight into one buffer
+        buffer = io.StringIO()
+        buffer.write(_SYNTHESIS_PROMPT_PREFIX)
+        buffer.write(f"{cluster_name}\nNumber of Videos: {len(transcripts)}")
+        buffer.write(_SYNTHESIS_PROMPT_BODY)
+        for i, ((video_id, _), summary) in enumerate(zip(transcripts, summaries), 1):
+            buffer.write(f"Video {i} ({video_id}):\n")
+            buffer.write(summary)
+            buffer.write("\n\n")
+        
+        return buffer.getvalue()
+    
+    def _summarize_transcripts(self, transcripts: Collection[Tuple[str, str]]) -> List[str]:
+        """Summarize transcripts concurrently, preserving input order.
         
-        return self.call_llm(prompt, max_tokens=3000)
+        Falls back to the raw transcript for any video whose summary fails.
+        """
+        if not transcripts:
+            return []
+        
+        def summarize(video_id: str, transcript: str) -> str:
+            result = self.generate_summary(transcript, video_id)
+            if result['success']:
+                return result['response']
+            logger.warning(f"Failed to summarize {video_id}: {result['error']}")
+            return transcript
+        
+        with ThreadPoolExecutor(max_workers=min(len(transcripts), _MAX_SUMMARY_WORKERS)) as executor:
+            return list(executor.map(lambda item: summarize(*item), transcripts))
     
     def extract_keywords_for_wikilinks(self, text: str) -> List[str]:
         """Extract keywords that should be converted to WikiLinks."""
-        prompt = f"""
-        Extract important concepts, terms, and keywords from the following text that would be valuable as WikiLinks in a knowledge graph.
-        Focus on:
-        - Technical terms
-        - Concepts and theories
-        - Names of people, places, or organizations
-        - Important ideas or methodologies
-        
-        Return only a comma-separated list of keywords, without explanations.
-        
-        Text:
-        {text}
-        """
+        prompt = ''.join((_KEYWORDS_PROMPT_PREFIX, text, '\n'))
         
         result = self.call_llm(prompt, max_tokens=500)
         if result['success']:
-            keywords = [kw.strip() for kw in result['response'].split(',')]
-            return [kw for kw in keywords if len(kw) > 2]  # Filter out very short keywords
+            return self._parse_keywords(result['response'])
         return []
     
+    def _parse_keywords(self, response: str) -> List[str]:
+        """Split a comma-separated keyword response into a cleaned, de-duplicated list."""
+        # Filter out very short keywords; dict.fromkeys drops repeats while keeping order
+        return list(dict.fromkeys(
+            kw for kw in (raw.strip() for raw in response.split(',')) if len(kw) > 2
+        ))
+    
     def add_wikilinks(self, text: str, keywords: List[str]) -> str:
         """Add WikiLinks to the text for the specified keywords."""
-        # Sort keywords by length (longest first) to avoid partial matches
-        keywords.sort(key=len, reverse=True)
-        
-        processed_text = text
-        for keyword in keywords:
-            # Create a regex pattern that matches the keyword as a whole word
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            replacement = f'[[{keyword}]]'
-            processed_text = re.sub(pattern, replacement, processed_text, flags=re.IGNORECASE)
-        
-        return processed_text
+        # Drop keywords that never occur; a substring check is far cheaper than a regex scan
+        text_lower = text.lower()
+        present_keywords = [keyword for keyword in keywords if keyword and keyword.lower() in text_lower]
+        if not present_keywords:
+            return text
+        
+        pattern, replacements = _compile_wikilink_pattern(frozenset(present_keywords))
+        return pattern.sub(
+            lambda match: replacements.get(match.group(0).lower(), f'[[{match.group(0)}]]'),
+            text
+        )
 
 
 # Global instance
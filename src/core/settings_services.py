@@ -0,0 +1,114 @@
+import time
+import logging
+import functools
+import threading
+import orjson
+import redis
+from typing import Optional
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from ..models import LLMProvider, Settings
+
+logger = logging.getLogger(__name__)
+
+SETTINGS_KEY = "settings"
+SETTINGS_CHANNEL = "settings-updated"
+SETTINGS_CACHE_TTL = 5.0  # seconds
+
+# Process-local cache of the last settings read from Redis
+_cache_lock = threading.Lock()
+_cached_settings = None
+_cache_expires_at = 0.0
+
+
+class EnvSettings(BaseSettings):
+    """Settings from the environment and .env file, parsed once per process."""
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+    
+    llm_provider: LLMProvider = LLMProvider.OPENAI
+    openai_api_key: Optional[str] = None
+    anthropic_api_key: Optional[str] = None
+    ollama_base_url: str = 'http://localhost:11434'
+    max_cost_limit: float = 0.10
+    youtube_api_key: Optional[str] = None
+    
+    # Async LLM dispatch limits (0 disables the per-minute limits)
+    llm_max_concurrency: int = 8
+    llm_rpm: int = 0
+    llm_tpm: int = 0
+    
+    # Infrastructure
+    redis_url: str = 'redis://localhost:6379'
+    celery_broker_url: str = 'redis://localhost:6379/0'
+    celery_result_backend: str = 'redis://localhost:6379/0'
+    output_dir: str = './output'
+    template_auto_reload: bool = False
+    ssl_enabled: bool = False
+    ssl_cert_path: Optional[str] = None
+    ssl_key_path: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=None)
+def env_settings() -> EnvSettings:
+    """Get the environment configuration, read once per process."""
+    return EnvSettings()
+
+
+@functools.lru_cache(maxsize=None)
+def default_settings() -> Settings:
+    """Settings used until settings are saved from the settings page."""
+    return Settings(**env_settings().model_dump(include=set(Settings.model_fields)))
+
+
+redis_client = redis.Redis.from_url(env_settings().redis_url)
+
+
+def get_settings() -> Settings:
+    """Get the current settings, re-reading Redis at most every SETTINGS_CACHE_TTL seconds."""
+    global _cached_settings, _cache_expires_at
+
+    with _cache_lock:
+        if _cached_settings is not None and time.monotonic() < _cache_expires_at:
+            return _cached_settings
+
+        try:
+            data = redis_client.get(SETTINGS_KEY)
+            settings = Settings(**orjson.loads(data)) if data else default_settings()
+        except Exception as e:
+            logger.error(f"Error loading settings: {e}")
+            settings = _cached_settings or default_settings()
+
+        _cached_settings = settings
+        _cache_expires_at = time.monotonic() + SETTINGS_CACHE_TTL
+        return settings
+
+
+def save_settings(settings: Settings) -> None:
+    """Persist settings to Redis and notify every process to drop its cached copy."""
+    redis_client.set(SETTINGS_KEY, orjson.dumps(settings.model_dump(mode='json')))
+    redis_client.publish(SETTINGS_CHANNEL, "1")
+    invalidate_settings_cache()
+
+
+def invalidate_settings_cache() -> None:
+    """Force the next get_settings call to re-read Redis."""
+    global _cache_expires_at
+    with _cache_lock:
+        _cache_expires_at = 0.0
+
+
+def start_settings_listener() -> threading.Thread:
+    """Invalidate the local settings cache whenever another process saves settings."""
+    def listen():
+        while True:
+            try:
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(SETTINGS_CHANNEL)
+                for _ in pubsub.listen():
+                    invalidate_settings_cache()
+            except Exception as e:
+                logger.warning(f"Settings listener disconnected, retrying: {e}")
+                time.sleep(SETTINGS_CACHE_TTL)
+
+    thread = threading.Thread(target=listen, name="settings-listener", daemon=True)
+    thread.start()
+    return thread
@@ -1,98 +1,117 @@
 import re
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from youtube_transcript_api import YouTubeTranscriptApi
 from urllib.parse import urlparse, parse_qs
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; these run for every URL and transcript processed
+_URL_PATTERNS = [
+    re.compile(r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)'),
+    re.compile(r'youtube\.com\/watch\?.*v=([^&\n?#]+)'),
+]
+
+# Common YouTube patterns removed by clean_transcript, fused into a single
+# alternation so the transcript is scanned once instead of once per pattern
+_CLEAN_PATTERN = re.compile(
+    r'\[.*?\]'  # Text in brackets (like [Music], [Applause])
+    r'|\(.*?\)'  # Text in parentheses
+    r'|\b(?:um|uh|ah|er|hmm|like|you know|i mean|basically|actually|literally)\b'
+    r'|\b(?:sponsored|advertisement|ad|promotion)\b'
+    r'|please like and subscribe'
+    r'|thanks for watching'
+    r'|hit the bell icon'
+    r'|comment below',
+    re.IGNORECASE
+)
+
+_WS_PATTERN = re.compile(r'\s+')
+_WORD_PATTERN = re.compile(r'\S+')
+
 
 def extract_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from various URL formats."""
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([^&\n?#]+)',
-        r'youtube\.com\/watch\?.*v=([^&\n?#]+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _URL_PATTERNS:
+        match = pattern.search(url)
         if match:
             return match.group(1)
     
     return None
 
 
-def get_video_info(video_id: str) -> Dict[str, Any]:
-    """Get basic video information."""
+def _fetch_info_and_transcript(video_id: str, language: str = 'en', fetch_text: bool = True) -> Tuple[Dict[str, Any], Optional[str]]:
+    """List a video's transcripts once and return its info and transcript text.
+    
+    The text is None when it was not requested or could not be fetched.
+    """
     try:
         transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        transcript = transcript_list.find_transcript(['en'])
-        
-        # Get video metadata if possible
-        video_info = {
-            'video_id': video_id,
-            'transcript_available': True,
-            'language': transcript.language,
-            'language_code': transcript.language_code,
-        }
         
-        return video_info
+        # Try to get transcript in the specified language
+        try:
+            transcript = transcript_list.find_transcript([language])
+        except:
+            # Fallback to auto-translated English if original language not available
+            transcript = transcript_list.find_transcript(['en'])
     except Exception as e:
         logger.error(f"Error getting video info for {video_id}: {e}")
         return {
             'video_id': video_id,
             'transcript_available': False,
             'error': str(e)
-        }
-
-
-def fetch_transcript(video_id: str, language: str = 'en') -> Optional[str]:
-    """Fetch transcript for a YouTube video."""
+        }, None
+    
+    # Get video metadata if possible
+    video_info = {
+        'video_id': video_id,
+        'transcript_available': True,
+        'language': transcript.language,
+        'language_code': transcript.language_code,
+    }
+    
+    if not fetch_text:
+        return video_info, None
+    
     try:
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        # Try to get transcript in the specified language
-        try:
-            transcript = transcript_list.find_transcript([language])
-        except:
-            # Fallback to auto-translated English if original language not available
-            transcript = transcript_list.find_transcript(['en'])
-        
         # Convert transcript to text
-        transcript_text = ' '.join([entry['text'] for entry in transcript.fetch()])
+        transcript_text = ' '.join(entry['text'] for entry in transcript.fetch())
         
         logger.info(f"Successfully fetched transcript for video {video_id}")
-        return transcript_text
+        return video_info, transcript_text
         
     except Exception as e:
         logger.error(f"Error fetching transcript for video {video_id}: {e}")
-        return None
+        return video_info, None
+
+
+def get_video_info(video_id: str) -> Dict[str, Any]:
+    """Get basic video information."""
+    video_info, _ = _fetch_info_and_transcript(video_id, fetch_text=False)
+    return video_info
+
+
+def fetch_transcript(video_id: str, language: str = 'en') -> Optional[str]:
+    """Fetch transcript for a YouTube video."""
+    _, transcript_text = _fetch_info_and_transcript(video_id, language)
+    return transcript_text
 
 
 def clean_transcript(transcript: str) -> str:
     """Clean transcript by removing common filler words and patterns."""
-    # Remove common YouTube patterns
-    patterns_to_remove = [
-        r'\[.*?\]',  # Remove text in brackets (like [Music], [Applause])
-        r'\(.*?\)',  # Remove text in parentheses
-        r'\b(um|uh|ah|er|hmm|like|you know|i mean|basically|actually|literally)\b',
-        r'\b(sponsored|advertisement|ad|promotion)\b.*?',
-        r'please like and subscribe.*?',
-        r'thanks for watching.*?',
-        r'hit the bell icon.*?',
-        r'comment below.*?',
-    ]
-    
-    cleaned = transcript
-    for pattern in patterns_to_remove:
-        cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+    cleaned = _CLEAN_PATTERN.sub('', transcript)
     
     # Remove extra whitespace
-    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+    cleaned = _WS_PATTERN.sub(' ', cleaned).strip()
     
     return cleaned
 
 
+def count_words(text: str) -> int:
+    """Count whitespace-separated words without building a list of them."""
+    return sum(1 for _ in _WORD_PATTERN.finditer(text))
+
+
 def process_video_url(url: str, clean: bool = False) -> Dict[str, Any]:
     """Process a YouTube URL and return transcript and metadata."""
     video_id = extract_video_id(url)
@@ -102,8 +121,8 @@ def process_video_url(url: str, clean: bool = False) -> Dict[str, Any]:
             'error': 'Invalid YouTube URL'
         }
     
-    # Get video info
-    video_info = get_video_info(video_id)
+    # Get video info and transcript with a single transcript listing
+    video_info, transcript = _fetch_info_and_transcript(video_id)
     if not video_info.get('transcript_available'):
         return {
             'success': False,
@@ -111,8 +130,6 @@ def process_video_url(url: str, clean: bool = False) -> Dict[str, Any]:
             'video_info': video_info
         }
     
-    # Fetch transcript
-    transcript = fetch_transcript(video_id)
     if not transcript:
         return {
             'success': False,
@@ -130,6 +147,6 @@ def process_video_url(url: str, clean: bool = False) -> Dict[str, Any]:
         'transcript': transcript,
         'cleaned': clean,
         'video_info': video_info,
-        'word_count': len(transcript.split()),
+        'word_count': count_words(transcript),
         'character_count': len(transcript)
     } 
\ No newline at end of file
@@ -1,42 +1,255 @@
+import io
 import os
+import re
+import orjson
+import time
+import asyncio
+import anyio
 import uuid
+import hashlib
 import logging
+from contextlib import asynccontextmanager
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from fastapi import FastAPI, Request, Form, HTTPException
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, StreamingResponse, Response
 from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from pydantic import ValidationError
-from dotenv import load_dotenv
+from celery import states
+import redis.asyncio as aioredis
+import zstandard
 
-from .models import Settings, VideoRequest, ClusterRequest, TaskResult
+from .models import Settings, VideoRequest, ClusterRequest, TaskResult, VIDEO_URL_ADAPTER, VIDEO_URL_LIST_ADAPTER
 from .core.llm_services import llm_service
-from .core.youtube_services import process_video_url
+from .core.settings_services import env_settings, get_settings, save_settings, start_settings_listener
+from .core.youtube_services import process_video_url, extract_video_id
 from .worker import (
     generate_single_summary, 
     process_cluster_transcripts,
     clean_cluster_transcripts,
     synthesize_cluster_report,
     get_all_clusters,
-    load_cluster_state
+    load_cluster_state,
+    summary_cache_key
 )
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load settings once at startup and keep them in sync with other processes."""
+    get_settings()
+    start_settings_listener()
+    yield
+
+
 # Initialize FastAPI app
-app = FastAPI(title="YT Research Refinery", version="1.0.0")
+app = FastAPI(
+    title="YT Research Refinery",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+
+class PageGZipMiddleware(GZipMiddleware):
+    """Gzip responses except SSE streams, which must reach the browser unbuffered."""
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/task-stream/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(PageGZipMiddleware, minimum_size=1024)
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception) -> HTMLResponse:
+    """Log unexpected errors and show them as an error banner.
+    
+    htmx only swaps successful responses, so the banner is sent with a 200.
+    """
+    logger.error(f"Error handling {request.method} {request.url.path}: {exc}")
+    return HTMLResponse(alert('red', f'Error: {exc}'))
+
+# Responses for fixed messages, built once and returned as-is by every request
+SETTINGS_SAVED_RESPONSE = HTMLResponse(
+    '<div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded">'
+    'Settings saved successfully!</div>'
+)
+INVALID_URL_RESPONSE = HTMLResponse(
+    '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
+    'Please enter a valid URL</div>'
+)
+MISSING_URLS_RESPONSE = HTMLResponse(
+    '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
+    'Please provide at least one URL</div>'
+)
+NO_CLUSTERS_RESPONSE = HTMLResponse('<div class="text-center py-8 text-gray-500">No active research clusters found.</div>')
+
+# Templates are compiled once per process and their bytecode is cached on disk;
+# set TEMPLATE_AUTO_RELOAD=true while editing templates
+templates = Jinja2Templates(
+    directory="src/templates",
+    auto_reload=env_settings().template_auto_reload,
+    bytecode_cache=FileSystemBytecodeCache()
+)
+
+# Status fragments are rendered from compiled, autoescaped Jinja partials
+alert = templates.get_template("partials/alert.html").module.alert
+SINGLE_RESULT_TEMPLATE = templates.get_template("partials/single_result.html")
+CLUSTER_RESULT_TEMPLATE = templates.get_template("partials/cluster_result.html")
+CLUSTER_PROGRESS_TEMPLATE = templates.get_template("partials/cluster_progress.html")
+SYNTHESIS_RESULT_TEMPLATE = templates.get_template("partials/synthesis_result.html")
+CLUSTER_CARD_TEMPLATE = templates.get_template("partials/cluster_card.html")
+TASK_STARTED_TEMPLATE = templates.get_template("partials/task_started.html")
+
+# Async client for the Celery result backend; status reads go straight to the
+# task meta keys so they never block the event loop
+result_redis = aioredis.from_url(env_settings().celery_result_backend)
+
+# Async client for application data written by the worker, such as reports
+app_redis = aioredis.from_url(env_settings().redis_url)
+
+REPORT_CHUNK_SIZE = 64 * 1024
+
+# Random bytes for session IDs, refilled in bulk to avoid a urandom call per ID
+ENTROPY_POOL_SIZE = 4096
+entropy_pool = b''
+entropy_offset = 0
+
+
+def uuid7() -> str:
+    """Generate a time-ordered UUIDv7 string from a 48-bit ms timestamp and pooled random bits."""
+    global entropy_pool, entropy_offset
+    
+    if entropy_offset + 10 > len(entropy_pool):
+        entropy_pool = os.urandom(ENTROPY_POOL_SIZE)
+        entropy_offset = 0
+    random_bits = int.from_bytes(entropy_pool[entropy_offset:entropy_offset + 10], 'big')
+    entropy_offset += 10
+    
+    value = (time.time_ns() // 1_000_000) << 80 | random_bits
+    value = value & ~(0xF << 76) | 0x7 << 76  # version 7
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+# Canonical lowercase UUID strings, as produced by uuid7(); older sessions used uuid4
+SESSION_ID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
+# Single-video tasks still running, keyed by video/cleaning mode/model, so that
+# duplicate submissions attach to the task that is already in flight. Each entry
+# is (task_id, submitted_at)
+inflight_tasks: Dict[str, Tuple[str, float]] = {}
+inflight_lock = asyncio.Lock()
+
+# A task reports progress as soon as a worker starts it, so one with no stored
+# meta after this long was lost or its result expired
+INFLIGHT_QUEUED_GRACE = 600  # seconds
+
+
+def release_inflight_task(task_id: str) -> None:
+    """Forget a finished task so the next submission starts a fresh one."""
+    for key in [key for key, (value, _) in inflight_tasks.items() if value == task_id]:
+        del inflight_tasks[key]
+
+
+async def live_inflight_task(cache_key: str) -> Optional[str]:
+    """Get the in-flight task for a submission, dropping it if it already finished.
+    
+    Entries are normally released by the status stream, but nothing streams a
+    task nobody is watching, so check its stored state before reusing it.
+    """
+    entry = inflight_tasks.get(cache_key)
+    if entry is None:
+        return None
+    
+    task_id, submitted_at = entry
+    data = await result_redis.get(f"celery-task-meta-{task_id}")
+    if data is None:
+        if time.monotonic() - submitted_at < INFLIGHT_QUEUED_GRACE:
+            return task_id
+    elif orjson.loads(data)['status'] not in states.READY_STATES:
+        return task_id
+    
+    del inflight_tasks[cache_key]
+    return None
+
+
+# Rendered fragments for finished tasks; results never change once a task is ready
+TERMINAL_STATUS_CACHE_SIZE = 4096
+terminal_status_cache: "OrderedDict[str, str]" = OrderedDict()
+
+# Bound concurrent status reads and drop ones that can no longer answer in time
+STATUS_READ_CONCURRENCY = 64
+STATUS_READ_DEADLINE = 1.5  # seconds
+status_read_semaphore = asyncio.Semaphore(STATUS_READ_CONCURRENCY)
+
 
-# Templates
-templates = Jinja2Templates(directory="src/templates")
+async def read_task_meta(task_id: str) -> Dict[str, Any]:
+    """Read a task's stored Celery meta, treating unknown tasks as pending."""
+    data = await result_redis.get(f"celery-task-meta-{task_id}")
+    return orjson.loads(data) if data else {'status': states.PENDING, 'result': None}
 
-# Global settings (in production, this should be stored in a database)
-current_settings = Settings()
+
+def task_state(meta: Dict[str, Any]):
+    """Get the (state, info) pair from a Celery task meta payload."""
+    state = meta['status']
+    info = meta.get('result')
+    if state == states.FAILURE and isinstance(info, dict):
+        info = f"{info.get('exc_type')}: {info.get('exc_message')}"
+    return state, info
+
+
+async def read_task_meta_bounded(task_id: str) -> Optional[Dict[str, Any]]:
+    """Read a task's meta under the status semaphore, or None past the deadline."""
+    with anyio.move_on_after(STATUS_READ_DEADLINE):
+        async with status_read_semaphore:
+            return await read_task_meta(task_id)
+    return None
+
+
+async def task_status_response(request: Request, task_id: str, kind: str, render) -> Response:
+    """Build a polling response for a task, caching fragments of finished tasks.
+    
+    Finished tasks get an ETag and an immutable Cache-Control header, so repeat
+    polls are answered with 304 Not Modified and no body.
+    """
+    cache_key = f"{kind}:{task_id}"
+    html = terminal_status_cache.get(cache_key)
+    if html is None:
+        meta = await read_task_meta_bounded(task_id)
+        if meta is None:
+            # Overloaded; htmx keeps the current fragment on 204 and polls again
+            return Response(status_code=204)
+        
+        state, info = task_state(meta)
+        html = render(state, info)
+        if state not in states.READY_STATES:
+            return HTMLResponse(html)
+        
+        terminal_status_cache[cache_key] = html
+        if len(terminal_status_cache) > TERMINAL_STATUS_CACHE_SIZE:
+            terminal_status_cache.popitem(last=False)
+    else:
+        terminal_status_cache.move_to_end(cache_key)
+    
+    etag = '"' + hashlib.md5(cache_key.encode()).hexdigest() + '"'
+    headers = {'ETag': etag, 'Cache-Control': 'public, max-age=31536000, immutable'}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(html, headers=headers)
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -50,7 +263,7 @@ async def settings_page(request: Request):
     """Settings page for LLM configuration."""
     return templates.TemplateResponse("settings.html", {
         "request": request,
-        "settings": current_settings
+        "settings": await anyio.to_thread.run_sync(get_settings)
     })
 
 
@@ -65,37 +278,19 @@ async def update_settings(
     youtube_api_key: str = Form(None)
 ):
     """Update application settings."""
-    try:
-        # Update global settings
-        current_settings.llm_provider = llm_provider
-        current_settings.openai_api_key = openai_api_key
-        current_settings.anthropic_api_key = anthropic_api_key
-        current_settings.ollama_base_url = ollama_base_url
-        current_settings.max_cost_limit = max_cost_limit
-        current_settings.youtube_api_key = youtube_api_key
-        
-        # Update environment variables
-        os.environ['LLM_PROVIDER'] = llm_provider
-        if openai_api_key:
-            os.environ['OPENAI_API_KEY'] = openai_api_key
-        if anthropic_api_key:
-            os.environ['ANTHROPIC_API_KEY'] = anthropic_api_key
-        if ollama_base_url:
-            os.environ['OLLAMA_BASE_URL'] = ollama_base_url
-        os.environ['MAX_COST_LIMIT'] = str(max_cost_limit)
-        if youtube_api_key:
-            os.environ['YOUTUBE_API_KEY'] = youtube_api_key
-        
-        return HTMLResponse(
-            '<div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded">'
-            'Settings saved successfully!</div>'
-        )
-    except Exception as e:
-        logger.error(f"Error updating settings: {e}")
-        return HTMLResponse(
-            '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error saving settings: {str(e)}</div>'
-        )
+    # Settings are read and written with the sync Redis client, so run off the event loop.
+    # Blank secret fields keep the previously saved value
+    current = await anyio.to_thread.run_sync(get_settings)
+    await anyio.to_thread.run_sync(save_settings, Settings(
+        llm_provider=llm_provider,
+        openai_api_key=openai_api_key or current.openai_api_key,
+        anthropic_api_key=anthropic_api_key or current.anthropic_api_key,
+        ollama_base_url=ollama_base_url or current.ollama_base_url,
+        max_cost_limit=max_cost_limit,
+        youtube_api_key=youtube_api_key or current.youtube_api_key
+    ))
+    
+    return SETTINGS_SAVED_RESPONSE
 
 
 @app.post("/process-single-video")
@@ -105,83 +300,57 @@ async def process_single_video(
     clean_transcript: bool = Form(False)
 ):
     """Process a single video and generate summary."""
+    # Validate URL
     try:
-        # Validate URL
-        if not url.startswith(('http://', 'https://')):
+        url = VIDEO_URL_ADAPTER.validate_python(url.strip())
+    except ValidationError:
+        return INVALID_URL_RESPONSE
+    
+    # Reuse a finished summary of the same video, cleaning mode and model
+    video_id = extract_video_id(url)
+    if video_id:
+        llm_service.apply_settings(await anyio.to_thread.run_sync(get_settings))
+        cache_key = summary_cache_key(video_id, clean_transcript, llm_service.get_model_for_provider())
+        cached = await app_redis.get(cache_key)
+        if cached:
             return HTMLResponse(
-                '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                'Please enter a valid URL</div>'
+                render_single_task_status(states.SUCCESS, orjson.loads(cached)),
+                headers={'Cache-Control': 'private, max-age=3600'}
             )
-        
-        # Start Celery task
-        task = generate_single_summary.delay(url, clean_transcript)
-        
-        return HTMLResponse(
-            f'<div class="bg-blue-100 border border-blue-400 text-blue-700 px-4 py-3 rounded">'
-            f'Processing video... Task ID: {task.id}</div>'
-            f'<div id="task-result" hx-get="/task-status/{task.id}" hx-trigger="load, every 2s" hx-swap="innerHTML"></div>'
-        )
-        
-    except Exception as e:
-        logger.error(f"Error processing single video: {e}")
-        return HTMLResponse(
-            '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error processing video: {str(e)}</div>'
-        )
+    else:
+        cache_key = f"url:{url}:{int(clean_transcript)}"
+    
+    # Start Celery task, unless an identical one is already running
+    async with inflight_lock:
+        task_id = await live_inflight_task(cache_key)
+        if task_id is None:
+            task_id = generate_single_summary.delay(url, clean_transcript).id
+            inflight_tasks[cache_key] = (task_id, time.monotonic())
+    
+    return HTMLResponse(render_task_started('single', task_id, f'Processing video... Task ID: {task_id}'))
 
 
 @app.get("/task-status/{task_id}")
-async def get_task_status(task_id: str):
+async def get_task_status(request: Request, task_id: str):
     """Get the status of a Celery task."""
-    try:
-        from celery.result import AsyncResult
-        task_result = AsyncResult(task_id)
-        
-        if task_result.ready():
-            if task_result.successful():
-                result = task_result.result
-                if result['success']:
-                    return HTMLResponse(
-                        f'<div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded mb-4">'
-                        f'Processing completed successfully!</div>'
-                        f'<div class="bg-white border rounded p-4">'
-                        f'<h3 class="font-semibold mb-2">Summary</h3>'
-                        f'<p class="text-gray-700 mb-4">{result["summary"]}</p>'
-                        f'<div class="text-sm text-gray-500 mb-4">'
-                        f'Word count: {result["word_count"]} | '
-                        f'Character count: {result["character_count"]} | '
-                        f'Model: {result.get("model", "Unknown")}</div>'
-                        f'<a href="/download-transcript/{result["video_id"]}" '
-                        f'class="bg-blue-600 text-white px-4 py-2 rounded hover:bg-blue-700">Download Transcript</a> '
-                        f'<a href="/download-summary/{result["video_id"]}" '
-                        f'class="bg-green-600 text-white px-4 py-2 rounded hover:bg-green-700">Download Summary</a>'
-                        f'</div>'
-                    )
-                else:
-                    return HTMLResponse(
-                        f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                        f'Error: {result["error"]}</div>'
-                    )
+    return await task_status_response(request, task_id, 'single', render_single_task_status)
+
+
+def render_single_task_status(state: str, info: Any) -> str:
+    """Render the status fragment for a single video task."""
+    if state in states.READY_STATES:
+        if state == states.SUCCESS:
+            result = info
+            if result['success']:
+                return SINGLE_RESULT_TEMPLATE.render(result=result)
             else:
-                return HTMLResponse(
-                    f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                    f'Task failed: {task_result.info}</div>'
-                )
+                return alert('red', f'Error: {result["error"]}')
         else:
-            # Task is still running
-            meta = task_result.info or {}
-            status = meta.get('status', 'Processing...')
-            return HTMLResponse(
-                f'<div class="bg-blue-100 border border-blue-400 text-blue-700 px-4 py-3 rounded">'
-                f'{status}</div>'
-            )
-            
-    except Exception as e:
-        logger.error(f"Error getting task status: {e}")
-        return HTMLResponse(
-            f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error checking task status: {str(e)}</div>'
-        )
+            return alert('red', f'Task failed: {info}')
+    else:
+        # Task is still running
+        meta = info if isinstance(info, dict) else {}
+        return alert('blue', meta.get('status', 'Processing...'))
 
 
 @app.post("/create-cluster")
@@ -192,220 +361,195 @@ async def create_cluster(
     clean_transcripts: bool = Form(False)
 ):
     """Create a new research cluster."""
+    # Parse URLs
+    url_list = [url.strip() for url in urls.split('\n') if url.strip()]
+    
+    if not url_list:
+        return MISSING_URLS_RESPONSE
+    
+    # Validate URLs
     try:
-        # Parse URLs
-        url_list = [url.strip() for url in urls.split('\n') if url.strip()]
-        
-        if not url_list:
-            return HTMLResponse(
-                '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                'Please provide at least one URL</div>'
-            )
-        
-        # Validate URLs
-        for url in url_list:
-            if not url.startswith(('http://', 'https://')):
-                return HTMLResponse(
-                    '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                    f'Invalid URL: {url}</div>'
-                )
-        
-        # Generate session ID
-        session_id = str(uuid.uuid4())
-        
-        # Start Celery task
-        task = process_cluster_transcripts.delay(session_id, name, url_list, clean_transcripts)
-        
-        return HTMLResponse(
-            f'<div class="bg-blue-100 border border-blue-400 text-blue-700 px-4 py-3 rounded">'
-            f'Creating research cluster "{name}"... Task ID: {task.id}</div>'
-            f'<div id="cluster-task-result" hx-get="/cluster-task-status/{task.id}" hx-trigger="load, every 3s" hx-swap="innerHTML"></div>'
-        )
-        
-    except Exception as e:
-        logger.error(f"Error creating cluster: {e}")
-        return HTMLResponse(
-            '<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error creating cluster: {str(e)}</div>'
-        )
+        url_list = VIDEO_URL_LIST_ADAPTER.validate_python(url_list)
+    except ValidationError as e:
+        invalid_url = url_list[e.errors()[0]['loc'][0]]
+        return HTMLResponse(alert('red', f'Invalid URL: {invalid_url}'))
+    
+    # Generate session ID
+    session_id = uuid7()
+    
+    # Start Celery task
+    task = process_cluster_transcripts.delay(session_id, name, url_list, clean_transcripts)
+    
+    return HTMLResponse(render_task_started('cluster', task.id, f'Creating research cluster "{name}"... Task ID: {task.id}'))
 
 
 @app.get("/cluster-task-status/{task_id}")
-async def get_cluster_task_status(task_id: str):
+async def get_cluster_task_status(request: Request, task_id: str):
     """Get the status of a cluster processing task."""
-    try:
-        from celery.result import AsyncResult
-        task_result = AsyncResult(task_id)
-        
-        if task_result.ready():
-            if task_result.successful():
-                result = task_result.result
-                if result['success']:
-                    session_id = result['session_id']
-                    return HTMLResponse(
-                        f'<div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded mb-4">'
-                        f'Cluster processing completed! Processed {result["processed_count"]}/{result["total_count"]} videos.</div>'
-                        f'<div class="bg-white border rounded p-4">'
-                        f'<h3 class="font-semibold mb-2">Next Steps</h3>'
-                        f'<p class="text-gray-700 mb-4">Your research cluster is ready for synthesis.</p>'
-                        f'<button hx-post="/synthesize-cluster/{session_id}" '
-                        f'hx-target="#cluster-task-result" '
-                        f'class="bg-green-600 text-white px-4 py-2 rounded hover:bg-green-700">'
-                        f'Generate Synthesis Report</button>'
-                        f'</div>'
-                    )
-                else:
-                    return HTMLResponse(
-                        f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                        f'Error: {result["error"]}</div>'
-                    )
+    return await task_status_response(request, task_id, 'cluster', render_cluster_task_status)
+
+
+def render_cluster_task_status(state: str, info: Any) -> str:
+    """Render the status fragment for a cluster processing task."""
+    if state in states.READY_STATES:
+        if state == states.SUCCESS:
+            result = info
+            if result['success']:
+                return CLUSTER_RESULT_TEMPLATE.render(result=result)
             else:
-                return HTMLResponse(
-                    f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                    f'Task failed: {task_result.info}</div>'
-                )
+                return alert('red', f'Error: {result["error"]}')
         else:
-            # Task is still running
-            meta = task_result.info or {}
-            status = meta.get('status', 'Processing cluster...')
-            current = meta.get('current', 0)
-            total = meta.get('total', 0)
-            
-            progress_html = ""
-            if current > 0 and total > 0:
-                progress_percent = (current / total) * 100
-                progress_html = f'<div class="w-full bg-gray-200 rounded-full h-2.5 mb-2">'
-                progress_html += f'<div class="bg-blue-600 h-2.5 rounded-full" style="width: {progress_percent}%"></div></div>'
-                progress_html += f'<p class="text-sm text-gray-600">{current}/{total} videos processed</p>'
-            
-            return HTMLResponse(
-                f'<div class="bg-blue-100 border border-blue-400 text-blue-700 px-4 py-3 rounded">'
-                f'{status}</div>'
-                f'{progress_html}'
-            )
-            
-    except Exception as e:
-        logger.error(f"Error getting cluster task status: {e}")
-        return HTMLResponse(
-            f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error checking task status: {str(e)}</div>'
+            return alert('red', f'Task failed: {info}')
+    else:
+        # Task is still running
+        meta = info if isinstance(info, dict) else {}
+        return CLUSTER_PROGRESS_TEMPLATE.render(
+            status=meta.get('status', 'Processing cluster...'),
+            current=meta.get('current', 0),
+            total=meta.get('total', 0)
         )
 
 
 @app.post("/synthesize-cluster/{session_id}")
 async def synthesize_cluster(session_id: str):
     """Generate synthesis report for a cluster."""
-    try:
-        # Start synthesis task
-        task = synthesize_cluster_report.delay(session_id)
-        
-        return HTMLResponse(
-            f'<div class="bg-blue-100 border border-blue-400 text-blue-700 px-4 py-3 rounded">'
-            f'Generating synthesis report... Task ID: {task.id}</div>'
-            f'<div id="synthesis-result" hx-get="/synthesis-task-status/{task.id}" hx-trigger="load, every 3s" hx-swap="innerHTML"></div>'
-        )
-        
-    except Exception as e:
-        logger.error(f"Error starting synthesis: {e}")
-        return HTMLResponse(
-            f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error starting synthesis: {str(e)}</div>'
-        )
+    # Start synthesis task
+    task = synthesize_cluster_report.delay(session_id)
+    
+    return HTMLResponse(render_task_started('synthesis', task.id, f'Generating synthesis report... Task ID: {task.id}'))
 
 
 @app.get("/synthesis-task-status/{task_id}")
-async def get_synthesis_task_status(task_id: str):
+async def get_synthesis_task_status(request: Request, task_id: str):
     """Get the status of a synthesis task."""
-    try:
-        from celery.result import AsyncResult
-        task_result = AsyncResult(task_id)
-        
-        if task_result.ready():
-            if task_result.successful():
-                result = task_result.result
-                if result['success']:
-                    return HTMLResponse(
-                        f'<div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded mb-4">'
-                        f'Synthesis report generated successfully!</div>'
-                        f'<div class="bg-white border rounded p-4">'
-                        f'<h3 class="font-semibold mb-2">Report Preview</h3>'
-                        f'<div class="max-h-64 overflow-y-auto mb-4 text-sm">'
-                        f'{result["report"][:500]}...</div>'
-                        f'<a href="/download-cluster-report/{result["session_id"]}" '
-                        f'class="bg-green-600 text-white px-4 py-2 rounded hover:bg-green-700">'
-                        f'Download Full Report</a>'
-                        f'</div>'
-                    )
-                else:
-                    return HTMLResponse(
-                        f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                        f'Error: {result["error"]}</div>'
-                    )
+    return await task_status_response(request, task_id, 'synthesis', render_synthesis_task_status)
+
+
+def render_synthesis_task_status(state: str, info: Any) -> str:
+    """Render the status fragment for a synthesis task."""
+    if state in states.READY_STATES:
+        if state == states.SUCCESS:
+            result = info
+            if result['success']:
+                return SYNTHESIS_RESULT_TEMPLATE.render(result=result)
             else:
-                return HTMLResponse(
-                    f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-                    f'Task failed: {task_result.info}</div>'
-                )
+                return alert('red', f'Error: {result["error"]}')
         else:
-            # Task is still running
-            meta = task_result.info or {}
-            status = meta.get('status', 'Generating synthesis report...')
-            return HTMLResponse(
-                f'<div class="bg-blue-100 border border-blue-400 text-blue-700 px-4 py-3 rounded">'
-                f'{status}</div>'
-            )
-            
+            return alert('red', f'Task failed: {info}')
+    else:
+        # Task is still running
+        meta = info if isinstance(info, dict) else {}
+        return alert('blue', meta.get('status', 'Generating synthesis report...'))
+
+
+# Status renderers and result containers for each task kind streamed over SSE
+TASK_STREAM_KINDS = {
+    'single': (render_single_task_status, 'task-result'),
+    'cluster': (render_cluster_task_status, 'cluster-task-result'),
+    'synthesis': (render_synthesis_task_status, 'synthesis-result'),
+}
+
+
+def render_task_started(kind: str, task_id: str, message: str) -> str:
+    """Render a task's started banner and the SSE container that streams its status."""
+    return TASK_STARTED_TEMPLATE.render(
+        message=message,
+        container_id=TASK_STREAM_KINDS[kind][1],
+        task_id=task_id,
+        kind=kind
+    )
+
+
+@app.get("/task-stream/{task_id}")
+async def stream_task_status(task_id: str, kind: str = 'single'):
+    """Stream task status fragments as Server-Sent Events.
+    
+    Subscribes to the Celery result backend's channel for the task and only
+    pushes an update when the task state actually changes.
+    """
+    if kind not in TASK_STREAM_KINDS:
+        raise HTTPException(status_code=404, detail="Unknown task kind")
+    
+    render, container_id = TASK_STREAM_KINDS[kind]
+    return StreamingResponse(
+        task_event_stream(task_id, render, container_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def task_event_stream(task_id: str, render, container_id: str):
+    """Yield an SSE event per task state change until the task finishes."""
+    channel = f"celery-task-meta-{task_id}"
+    pubsub = result_redis.pubsub()
+    await pubsub.subscribe(channel)
+    try:
+        # Read the stored state once, in case the task moved on before we subscribed
+        meta = await read_task_meta(task_id)
+        yield format_task_event(meta, render, container_id)
+        if meta['status'] in states.READY_STATES:
+            release_inflight_task(task_id)
+            return
+        
+        async for message in pubsub.listen():
+            if message['type'] != 'message':
+                continue
+            meta = orjson.loads(message['data'])
+            yield format_task_event(meta, render, container_id)
+            if meta['status'] in states.READY_STATES:
+                release_inflight_task(task_id)
+                return
     except Exception as e:
-        logger.error(f"Error getting synthesis task status: {e}")
-        return HTMLResponse(
-            f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error checking task status: {str(e)}</div>'
-        )
+        logger.error(f"Error streaming task status: {e}")
+    finally:
+        # Shielded so a client disconnect can't cancel the cleanup and leave the
+        # connection checked out of the pool
+        with anyio.CancelScope(shield=True):
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+
+
+def format_task_event(meta: Dict[str, Any], render, container_id: str) -> str:
+    """Format a Celery task meta payload as an SSE message event."""
+    state, info = task_state(meta)
+    html = render(state, info)
+    if state in states.READY_STATES:
+        # Replace the streaming container itself so the browser stops reconnecting
+        html = f'<div id="{container_id}" hx-swap-oob="true">{html}</div>'
+    
+    data = "".join(f"data: {line}\n" for line in html.splitlines() or [""])
+    return f"event: message\n{data}\n"
+
+
+# Badge classes for each cluster status
+CLUSTER_STATUS_COLORS = {
+    'pending': 'bg-yellow-100 text-yellow-800',
+    'processing': 'bg-blue-100 text-blue-800',
+    'transcripts_ready': 'bg-green-100 text-green-800',
+    'cleaned_ready': 'bg-green-100 text-green-800',
+    'completed': 'bg-green-100 text-green-800',
+    'failed': 'bg-red-100 text-red-800'
+}
+DEFAULT_STATUS_COLOR = 'bg-gray-100 text-gray-800'
 
 
 @app.get("/active-clusters")
 async def get_active_clusters():
     """Get all active research clusters."""
-    try:
-        clusters = get_all_clusters()
-        
-        if not clusters:
-            return HTMLResponse(
-                '<div class="text-center py-8 text-gray-500">No active research clusters found.</div>'
-            )
-        
-        html = '<div class="space-y-4">'
-        for cluster in clusters:
-            status_color = {
-                'pending': 'bg-yellow-100 text-yellow-800',
-                'processing': 'bg-blue-100 text-blue-800',
-                'transcripts_ready': 'bg-green-100 text-green-800',
-                'cleaned_ready': 'bg-green-100 text-green-800',
-                'completed': 'bg-green-100 text-green-800',
-                'failed': 'bg-red-100 text-red-800'
-            }.get(cluster['status'], 'bg-gray-100 text-gray-800')
-            
-            html += f'''
-            <div class="border rounded p-4">
-                <div class="flex justify-between items-start mb-2">
-                    <h3 class="font-semibold">{cluster['name']}</h3>
-                    <span class="px-2 py-1 rounded text-xs {status_color}">{cluster['status']}</span>
-                </div>
-                <p class="text-sm text-gray-600 mb-2">Videos: {len(cluster['urls'])}</p>
-                <p class="text-sm text-gray-600 mb-2">Created: {cluster['created_at'][:10]}</p>
-                <p class="text-sm text-gray-600">Updated: {cluster['updated_at'][:10]}</p>
-            </div>
-            '''
-        
-        html += '</div>'
-        return HTMLResponse(html)
-        
-    except Exception as e:
-        logger.error(f"Error getting active clusters: {e}")
-        return HTMLResponse(
-            f'<div class="bg-red-100 border border-red-400 text-red-700 px-4 py-3 rounded">'
-            f'Error loading clusters: {str(e)}</div>'
+    # The cluster scan uses the worker's sync Redis client, so run it off the event loop
+    clusters = await anyio.to_thread.run_sync(get_all_clusters)
+    
+    if not clusters:
+        return NO_CLUSTERS_RESPONSE
+    
+    cards = ''.join(
+        CLUSTER_CARD_TEMPLATE.render(
+            cluster=cluster,
+            status_color=CLUSTER_STATUS_COLORS.get(cluster.status, DEFAULT_STATUS_COLOR)
         )
+        for cluster in clusters
+    )
+    return HTMLResponse(f'<div class="space-y-4">{cards}</div>')
 
 
 @app.get("/download-transcript/{video_id}")
@@ -413,10 +557,7 @@ async def download_transcript(video_id: str):
     """Download transcript for a video."""
     # This would typically serve a file from the output directory
     # For now, return a placeholder response
-    return HTMLResponse(
-        f'<div class="bg-blue-100 border border-blue-400 text-blue-700 px-4 py-3 rounded">'
-        f'Transcript for {video_id} would be downloaded here.</div>'
-    )
+    return HTMLResponse(alert('blue', f'Transcript for {video_id} would be downloaded here.'))
 
 
 @app.get("/download-summary/{video_id}")
@@ -424,20 +565,32 @@ async def download_summary(video_id: str):
     """Download summary for a video."""
     # This would typically serve a file from the output directory
     # For now, return a placeholder response
-    return HTMLResponse(
-        f'<div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded">'
-        f'Summary for {video_id} would be downloaded here.</div>'
-    )
+    return HTMLResponse(alert('green', f'Summary for {video_id} would be downloaded here.'))
+
+
+def iter_report_chunks(data: bytes):
+    """Decompress a stored report in fixed-size chunks."""
+    reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data))
+    while True:
+        chunk = reader.read(REPORT_CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
 
 
 @app.get("/download-cluster-report/{session_id}")
 async def download_cluster_report(session_id: str):
     """Download cluster report."""
-    # This would typically serve a file from the output directory
-    # For now, return a placeholder response
-    return HTMLResponse(
-        f'<div class="bg-green-100 border border-green-400 text-green-700 px-4 py-3 rounded">'
-        f'Cluster report for session {session_id} would be downloaded here.</div>'
+    data = None
+    if SESSION_ID_PATTERN.fullmatch(session_id):
+        data = await app_redis.get(f"report:{session_id}:full")
+    if data is None:
+        return HTMLResponse(alert('red', f'Cluster report for session {session_id} not found.'), status_code=404)
+    
+    return StreamingResponse(
+        iter_report_chunks(data),
+        media_type="text/markdown",
+        headers={'Content-Disposition': f'attachment; filename="{session_id}.md"'}
     )
 
 
@@ -445,9 +598,10 @@ if __name__ == "__main__":
     import uvicorn
     
     # Check if SSL is enabled
-    ssl_enabled = os.getenv('SSL_ENABLED', 'false').lower() == 'true'
-    ssl_cert_path = os.getenv('SSL_CERT_PATH')
-    ssl_key_path = os.getenv('SSL_KEY_PATH')
+    env = env_settings()
+    ssl_enabled = env.ssl_enabled
+    ssl_cert_path = env.ssl_cert_path
+    ssl_key_path = env.ssl_key_path
     
     if ssl_enabled and ssl_cert_path and ssl_key_path:
         # Start with SSL
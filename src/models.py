@@ -1,5 +1,5 @@
-from pydantic import BaseModel, HttpUrl, Field
-from typing import List, Optional, Dict, Any
+from pydantic import AfterValidator, BaseModel, ConfigDict, HttpUrl, Field, TypeAdapter
+from typing import Annotated, List, Optional, Dict, Any
 from enum import Enum
 
 
@@ -9,7 +9,14 @@ class LLMProvider(str, Enum):
     OLLAMA = "ollama"
 
 
+# Frozen models are safe to share between requests and cached settings, and
+# ignoring unknown keys keeps older Redis payloads loadable
+_MODEL_CONFIG = ConfigDict(frozen=True, extra="ignore", str_strip_whitespace=True)
+
+
 class Settings(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     llm_provider: LLMProvider = LLMProvider.OPENAI
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
@@ -19,17 +26,23 @@ class Settings(BaseModel):
 
 
 class VideoRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     url: HttpUrl
     clean_transcript: bool = False
 
 
 class ClusterRequest(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     name: str = Field(..., min_length=1, max_length=100)
-    urls: List[HttpUrl] = Field(..., min_items=1)
+    urls: List[HttpUrl] = Field(..., min_length=1)
     clean_transcripts: bool = False
 
 
 class ClusterState(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     session_id: str
     name: str
     urls: List[str]
@@ -42,6 +55,8 @@ class ClusterState(BaseModel):
 
 
 class TaskResult(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     task_id: str
     status: str  # pending, running, completed, failed
     result: Optional[Any] = None
@@ -49,7 +64,18 @@ class TaskResult(BaseModel):
 
 
 class CostEstimate(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     estimated_cost: float
     token_count: int
     provider: str
-    model: str 
\ No newline at end of file
+    model: str 
+
+
+# Validates a whole JSON array of cluster states in a single pass
+CLUSTER_LIST_ADAPTER = TypeAdapter(List[ClusterState])
+
+# An http(s) URL, checked and normalized by pydantic-core and handed on as a plain string
+VideoUrl = Annotated[HttpUrl, AfterValidator(str)]
+VIDEO_URL_ADAPTER = TypeAdapter(VideoUrl)
+VIDEO_URL_LIST_ADAPTER = TypeAdapter(List[VideoUrl])
@@ -1,12 +1,21 @@
 import os
-import json
+import re
+import orjson
 import logging
+import functools
 import redis
+import zstandard
 from datetime import datetime
-from celery import Celery
-from typing import Dict, Any, List
-from .core.youtube_services import process_video_url
-from .core.llm_services import llm_service
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from celery import Celery, chord, group
+from celery.exceptions import Ignore
+from celery.signals import worker_process_init
+from pydantic import ValidationError
+from typing import Dict, Any, List, Tuple
+from .core.settings_services import env_settings, get_settings, start_settings_listener
+from .models import ClusterState, CLUSTER_LIST_ADAPTER
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,22 +24,118 @@ logger = logging.getLogger(__name__)
 # Initialize Celery
 celery = Celery('yt_research_refinery')
 celery.conf.update(
-    broker_url=os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0'),
-    result_backend=os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0'),
+    broker_url=env_settings().celery_broker_url,
+    result_backend=env_settings().celery_result_backend,
     task_serializer='json',
     accept_content=['json'],
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
+    redis_max_connections=64,
+    # Long, uneven LLM tasks: each worker process reserves one task at a time and
+    # acknowledges it only once done, so a lost worker's task is redelivered
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_reject_on_worker_lost=True,
+    task_acks_on_failure_or_timeout=False,
+    broker_transport_options={'visibility_timeout': 3600 * 2},
 )
 
-# Initialize Redis
-redis_client = redis.Redis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379'))
+# Initialize Redis with an explicitly sized pool shared by every task in this process
+redis_pool = redis.ConnectionPool.from_url(
+    env_settings().redis_url,
+    max_connections=64,
+    health_check_interval=30
+)
+redis_client = redis.Redis(connection_pool=redis_pool)
+
+
+@contextmanager
+def pipelined():
+    """Queue Redis writes on a pipeline and send them in one round trip on exit."""
+    pipe = redis_client.pipeline(transaction=False)
+    yield pipe
+    pipe.execute()
+
+# Characters dropped from cluster names when building report filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w -]+')
+
+# Cluster metadata is a small JSON document at cluster:<id>; transcripts are
+# kept in hashes so each write only sends the videos that changed
+CLUSTER_TTL = 3600 * 24 * 7  # 7 days
+CLUSTER_SCAN_BATCH = 500
+
+# Transcripts cleaned concurrently by one task
+CLEAN_BATCH_SIZE = 8
+
+# Cluster progress is published to the status stream at most once per interval
+PROGRESS_CHECKPOINT_MS = 1000
+CLUSTER_TRANSCRIPT_KEYS = {
+    'transcripts': "cluster-transcripts:{session_id}",
+    'cleaned_transcripts': "cluster-cleaned:{session_id}",
+}
+
+# Stores a fetched transcript (unless the fetch failed and the video ID is
+# empty) and bumps the cluster's progress counter and checkpoint in one
+# server-side call, so parallel fetchers never interleave their writes.
+# Returns {processed count, 1 if this call should publish progress}
+_RECORD_CLUSTER_VIDEO = redis_client.register_script("""
+if ARGV[1] ~= '' then
+    redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+end
+local current = redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+local checkpoint = redis.call('SET', KEYS[3], 1, 'NX', 'PX', ARGV[5])
+return {current, checkpoint and 1 or 0}
+""")
+
+# Transcripts and reports are zstd-compressed at rest; values written before
+# compression was added are plain UTF-8, which can never start with the zstd
+# frame magic number
+zstd_compressor = zstandard.ZstdCompressor(level=3)
+zstd_decompressor = zstandard.ZstdDecompressor()
+ZSTD_FRAME_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Synthesis reports are stored outside the task result so status polls only
+# carry a short preview
+REPORT_PREVIEW_CHARS = 500
+REPORT_TTL = 3600 * 24 * 7  # 7 days
+
+# Output files of one save are written in parallel rather than back to back
+_file_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="output-writer")
+
+# Finished single-video summaries are reused for repeat requests
+SUMMARY_CACHE_TTL = 3600 * 24 * 7  # 7 days
+
+
+def summary_cache_key(video_id: str, clean_transcript: bool, model: str) -> str:
+    """Build the Redis key for a cached single-video summary."""
+    return f"summary:{video_id}:{int(clean_transcript)}:{model}"
+
+
+@worker_process_init.connect
+def init_settings_listener(**kwargs) -> None:
+    """Drop cached settings as soon as they are changed from the web app."""
+    start_settings_listener()
+
+
+def get_llm_service():
+    """Get the LLM service with the latest saved settings applied.
+    
+    The service and its provider clients are imported on first use, so worker
+    processes that only fetch transcripts never load them.
+    """
+    from .core.llm_services import llm_service
+    llm_service.apply_settings(get_settings())
+    return llm_service
 
 
 @celery.task(bind=True)
 def generate_single_summary(self, video_url: str, clean_transcript: bool = False) -> Dict[str, Any]:
     """Process a single video and generate a summary."""
+    from .core.youtube_services import process_video_url
+    
     try:
         self.update_state(state='PROGRESS', meta={'status': 'Fetching transcript...'})
         
@@ -43,6 +148,7 @@ def generate_single_summary(self, video_url: str, clean_transcript: bool = False
             }
         
         self.update_state(state='PROGRESS', meta={'status': 'Generating summary...'})
+        llm_service = get_llm_service()
         
         # Generate summary using LLM
         summary_result = llm_service.generate_summary(
@@ -71,6 +177,7 @@ def generate_single_summary(self, video_url: str, clean_transcript: bool = False
         
         # Save to output directory
         save_single_video_result(final_result)
+        cache_single_summary(final_result, llm_service.get_model_for_provider())
         
         return final_result
         
@@ -87,6 +194,7 @@ def process_cluster_transcripts(self, session_id: str, cluster_name: str, urls:
     """Process all transcripts for a research cluster."""
     try:
         # Initialize cluster state
+        now_iso = datetime.now().isoformat()
         cluster_state = {
             'session_id': session_id,
             'name': cluster_name,
@@ -95,48 +203,107 @@ def process_cluster_transcripts(self, session_id: str, cluster_name: str, urls:
             'transcripts': {},
             'cleaned_transcripts': {},
             'summary': None,
-            'created_at': datetime.now().isoformat(),
-            'updated_at': datetime.now().isoformat()
+            'created_at': now_iso,
+            'updated_at': now_iso
         }
         
         # Save initial state
-        save_cluster_state(session_id, cluster_state)
+        save_cluster_meta(session_id, cluster_state)
         
         total_urls = len(urls)
-        processed_count = 0
-        
-        for i, url in enumerate(urls):
-            self.update_state(
-                state='PROGRESS', 
-                meta={
-                    'status': f'Processing video {i+1}/{total_urls}',
-                    'current': i + 1,
-                    'total': total_urls
-                }
+        self.update_state(
+            state='PROGRESS',
+            meta={'status': f'Processing {total_urls} videos...', 'current': 0, 'total': total_urls}
+        )
+        
+        # Fetch every video concurrently. The chord callback takes over this
+        # task's ID, so progress and the final result reach the same status stream
+        fetch_videos = group(
+            fetch_cluster_video.s(session_id, url, clean_transcripts, self.request.id, total_urls)
+            for url in urls
+        )
+        raise self.replace(chord(fetch_videos, finalize_cluster_transcripts.s(session_id, total_urls)))
+        
+    except Ignore:
+        raise
+    except Exception as e:
+        logger.error(f"Error in process_cluster_transcripts: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+@celery.task(bind=True)
+def fetch_cluster_video(self, session_id: str, url: str, clean_transcripts: bool, cluster_task_id: str, total_urls: int) -> Dict[str, Any]:
+    """Fetch one cluster video's transcript and report progress on the cluster task."""
+    from .core.youtube_services import process_video_url
+    
+    try:
+        result = process_video_url(url, clean_transcripts)
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+    
+    if not result['success']:
+        logger.warning(f"Failed to process video {url}: {result['error']}")
+    
+    # Store the transcript and count the video in one atomic round trip. Only
+    # the first video to finish in each checkpoint interval publishes progress
+    progress_key = f"cluster-progress:{session_id}"
+    try:
+        current, checkpoint = _RECORD_CLUSTER_VIDEO(
+            keys=[
+                CLUSTER_TRANSCRIPT_KEYS['transcripts'].format(session_id=session_id),
+                progress_key,
+                f"{progress_key}:checkpoint"
+            ],
+            args=[
+                result['video_id'] if result['success'] else '',
+                pack_transcript(result['transcript']) if result['success'] else b'',
+                CLUSTER_TTL,
+                3600 * 24,
+                PROGRESS_CHECKPOINT_MS
+            ]
+        )
+    except Exception as e:
+        logger.error(f"Error storing transcript for {url}: {e}")
+        return {'success': False, 'url': url, 'error': str(e)}
+    
+    try:
+        if checkpoint or current == total_urls:
+            self.backend.store_result(
+                cluster_task_id,
+                {'status': f'Processed video {current}/{total_urls}', 'current': current, 'total': total_urls},
+                'PROGRESS'
             )
-            
-            # Process video
-            result = process_video_url(url, clean_transcripts)
-            
-            if result['success']:
-                video_id = result['video_id']
-                cluster_state['transcripts'][video_id] = result['transcript']
-                
-                if clean_transcripts:
-                    cluster_state['cleaned_transcripts'][video_id] = result['transcript']
-                
-                processed_count += 1
-            else:
-                logger.warning(f"Failed to process video {url}: {result['error']}")
-            
-            # Update cluster state
-            cluster_state['updated_at'] = datetime.now().isoformat()
-            save_cluster_state(session_id, cluster_state)
-        
-        # Update final state
-        cluster_state['status'] = 'transcripts_ready'
-        cluster_state['updated_at'] = datetime.now().isoformat()
-        save_cluster_state(session_id, cluster_state)
+    except Exception as e:
+        logger.warning(f"Could not report cluster progress: {e}")
+    
+    if not result['success']:
+        return {'success': False, 'url': url, 'error': result['error']}
+    return {'success': True, 'video_id': result['video_id']}
+
+
+@celery.task
+def finalize_cluster_transcripts(results: List[Dict[str, Any]], session_id: str, total_urls: int) -> Dict[str, Any]:
+    """Mark the cluster ready once every video's transcript has been stored."""
+    try:
+        cluster_meta = load_cluster_meta(session_id)
+        if not cluster_meta:
+            return {
+                'success': False,
+                'error': 'Cluster not found'
+            }
+        
+        # Each fetch task already stored its own transcript
+        processed_count = len({result['video_id'] for result in results if result['success']})
+        
+        # Write the final state and drop the progress counter in one round trip
+        cluster_meta['status'] = 'transcripts_ready'
+        cluster_meta['updated_at'] = datetime.now().isoformat()
+        with pipelined() as pipe:
+            save_cluster_meta(session_id, cluster_meta, pipe)
+            pipe.delete(f"cluster-progress:{session_id}")
         
         return {
             'success': True,
@@ -147,7 +314,7 @@ def process_cluster_transcripts(self, session_id: str, cluster_name: str, urls:
         }
         
     except Exception as e:
-        logger.error(f"Error in process_cluster_transcripts: {e}")
+        logger.error(f"Error in finalize_cluster_transcripts: {e}")
         return {
             'success': False,
             'error': str(e)
@@ -159,30 +326,81 @@ def clean_cluster_transcripts(self, session_id: str) -> Dict[str, Any]:
     """Clean transcripts in a cluster using LLM."""
     try:
         # Load cluster state
-        cluster_state = load_cluster_state(session_id)
-        if not cluster_state:
+        if not redis_client.exists(f"cluster:{session_id}"):
             return {
                 'success': False,
                 'error': 'Cluster not found'
             }
         
+        transcripts_key = CLUSTER_TRANSCRIPT_KEYS['transcripts'].format(session_id=session_id)
+        video_ids = [key.decode() for key in redis_client.hkeys(transcripts_key)]
+        
         self.update_state(state='PROGRESS', meta={'status': 'Cleaning transcripts...'})
         
-        # Clean each transcript
-        for video_id, transcript in cluster_state['transcripts'].items():
-            clean_result = llm_service.clean_transcript_with_llm(transcript)
-            
-            if clean_result['success']:
-                cluster_state['cleaned_transcripts'][video_id] = clean_result['response']
-            else:
-                logger.warning(f"Failed to clean transcript for {video_id}: {clean_result['error']}")
-                # Fallback to original transcript
-                cluster_state['cleaned_transcripts'][video_id] = transcript
+        # Clean batches of transcripts in parallel tasks, each making its LLM calls
+        # concurrently; the chord callback takes over this task's ID so the final
+        # result reaches the same status stream
+        clean_all = group(
+            clean_cluster_transcript_batch.s(session_id, video_ids[start:start + CLEAN_BATCH_SIZE])
+            for start in range(0, len(video_ids), CLEAN_BATCH_SIZE)
+        )
+        raise self.replace(chord(clean_all, finalize_cluster_cleaning.s(session_id)))
+        
+    except Ignore:
+        raise
+    except Exception as e:
+        logger.error(f"Error in clean_cluster_transcripts: {e}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+@celery.task
+def clean_cluster_transcript_batch(session_id: str, video_ids: List[str]) -> List[Dict[str, Any]]:
+    """Clean a batch of cluster transcripts concurrently, falling back to the originals on failure."""
+    transcripts_key = CLUSTER_TRANSCRIPT_KEYS['transcripts'].format(session_id=session_id)
+    transcripts = [unpack_transcript(data) if data else '' for data in redis_client.hmget(transcripts_key, video_ids)]
+    
+    try:
+        llm_service = get_llm_service()
+        clean_results = llm_service.clean_transcripts(transcripts)
+    except Exception as e:
+        clean_results = [{'success': False, 'error': str(e)}] * len(transcripts)
+    
+    cleaned = []
+    for video_id, transcript, clean_result in zip(video_ids, transcripts, clean_results):
+        if clean_result['success']:
+            cleaned.append({'video_id': video_id, 'transcript': clean_result['response']})
+        else:
+            logger.warning(f"Failed to clean transcript for {video_id}: {clean_result['error']}")
+            # Fallback to original transcript
+            cleaned.append({'video_id': video_id, 'transcript': transcript})
+    return cleaned
+
+
+@celery.task
+def finalize_cluster_cleaning(batches: List[List[Dict[str, Any]]], session_id: str) -> Dict[str, Any]:
+    """Store all cleaned cluster transcripts in one write and mark the cluster cleaned."""
+    try:
+        cluster_meta = load_cluster_meta(session_id)
+        if not cluster_meta:
+            return {
+                'success': False,
+                'error': 'Cluster not found'
+            }
         
         # Update cluster state
-        cluster_state['status'] = 'cleaned_ready'
-        cluster_state['updated_at'] = datetime.now().isoformat()
-        save_cluster_state(session_id, cluster_state)
+        cluster_meta['status'] = 'cleaned_ready'
+        cluster_meta['updated_at'] = datetime.now().isoformat()
+        with pipelined() as pipe:
+            save_cluster_transcripts(
+                session_id,
+                'cleaned_transcripts',
+                {result['video_id']: result['transcript'] for batch in batches for result in batch},
+                pipe
+            )
+            save_cluster_meta(session_id, cluster_meta, pipe)
         
         return {
             'success': True,
@@ -191,7 +409,7 @@ def clean_cluster_transcripts(self, session_id: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Error in clean_cluster_transcripts: {e}")
+        logger.error(f"Error in finalize_cluster_cleaning: {e}")
         return {
             'success': False,
             'error': str(e)
@@ -202,8 +420,8 @@ def clean_cluster_transcripts(self, session_id: str) -> Dict[str, Any]:
 def synthesize_cluster_report(self, session_id: str) -> Dict[str, Any]:
     """Generate final synthesis report for a cluster."""
     try:
-        # Load cluster state
-        cluster_state = load_cluster_state(session_id)
+        # Load cluster metadata and the preferred (cleaned if available) transcript of each video
+        cluster_state, transcripts_to_use = load_synthesis_input(session_id)
         if not cluster_state:
             return {
                 'success': False,
@@ -211,22 +429,12 @@ def synthesize_cluster_report(self, session_id: str) -> Dict[str, Any]:
             }
         
         self.update_state(state='PROGRESS', meta={'status': 'Generating synthesis report...'})
+        llm_service = get_llm_service()
         
-        # Prepare transcripts for synthesis
-        transcripts_to_use = cluster_state.get('cleaned_transcripts', cluster_state['transcripts'])
-        
-        # Convert to list format for synthesis
-        transcript_list = []
-        for video_id, transcript in transcripts_to_use.items():
-            transcript_list.append({
-                'video_id': video_id,
-                'transcript': transcript
-            })
-        
-        # Generate synthesis report
-        synthesis_result = llm_service.synthesize_cluster_report(
+        # Generate the synthesis report, WikiLinked from keywords returned by the same call
+        synthesis_result = llm_service.synthesize_with_wikilinks(
             cluster_state['name'],
-            transcript_list
+            transcripts_to_use.items()
         )
         
         if not synthesis_result['success']:
@@ -235,24 +443,26 @@ def synthesize_cluster_report(self, session_id: str) -> Dict[str, Any]:
                 'error': synthesis_result['error']
             }
         
-        # Extract keywords and add WikiLinks
-        keywords = llm_service.extract_keywords_for_wikilinks(synthesis_result['response'])
-        final_report = llm_service.add_wikilinks(synthesis_result['response'], keywords)
+        keywords = synthesis_result['keywords']
+        final_report = synthesis_result['response']
+        report_preview = final_report[:REPORT_PREVIEW_CHARS]
         
-        # Update cluster state
-        cluster_state['summary'] = final_report
+        # Update cluster state; metadata keeps only a preview, since every cluster
+        # list poll reads it and the full report is stored under report:<id>:full
+        cluster_state['summary'] = report_preview
         cluster_state['status'] = 'completed'
         cluster_state['updated_at'] = datetime.now().isoformat()
-        save_cluster_state(session_id, cluster_state)
+        save_cluster_meta(session_id, cluster_state)
         
-        # Save report to output directory
-        save_cluster_report(session_id, cluster_state)
+        # Save report to output directory and to Redis for downloads
+        save_cluster_report(session_id, cluster_state['name'], final_report, len(transcripts_to_use))
+        save_report_blobs(session_id, final_report)
         
         return {
             'success': True,
             'session_id': session_id,
             'status': 'completed',
-            'report': final_report,
+            'report_preview': report_preview,
             'keywords': keywords
         }
         
@@ -264,58 +474,173 @@ def synthesize_cluster_report(self, session_id: str) -> Dict[str, Any]:
         }
 
 
-def save_cluster_state(session_id: str, state: Dict[str, Any]) -> None:
-    """Save cluster state to Redis."""
+def save_cluster_meta(session_id: str, state: Dict[str, Any], pipe=None) -> None:
+    """Save cluster metadata to Redis, or queue the write on a pipeline if given.
+    
+    Transcripts are left out; they live in per-cluster hashes written by
+    save_cluster_transcripts, so metadata updates never re-send them.
+    """
     try:
-        redis_client.setex(
-            f"cluster:{session_id}",
-            3600 * 24 * 7,  # 7 days TTL
-            json.dumps(state)
-        )
+        meta = {key: value for key, value in state.items() if key not in CLUSTER_TRANSCRIPT_KEYS}
+        (pipe or redis_client).setex(f"cluster:{session_id}", CLUSTER_TTL, orjson.dumps(meta))
     except Exception as e:
         logger.error(f"Error saving cluster state: {e}")
 
 
-def load_cluster_state(session_id: str) -> Dict[str, Any]:
-    """Load cluster state from Redis."""
+def save_cluster_transcripts(session_id: str, field: str, transcripts: Dict[str, str], pipe=None) -> None:
+    """Add transcripts to a cluster's 'transcripts' or 'cleaned_transcripts' hash."""
+    if not transcripts:
+        return
+    
+    try:
+        key = CLUSTER_TRANSCRIPT_KEYS[field].format(session_id=session_id)
+        transcripts = {video_id: pack_transcript(text) for video_id, text in transcripts.items()}
+        if pipe is None:
+            with pipelined() as pipe:
+                pipe.hset(key, mapping=transcripts)
+                pipe.expire(key, CLUSTER_TTL)
+        else:
+            pipe.hset(key, mapping=transcripts)
+            pipe.expire(key, CLUSTER_TTL)
+    except Exception as e:
+        logger.error(f"Error saving cluster transcripts: {e}")
+
+
+def save_report_blobs(session_id: str, report: str) -> None:
+    """Save the zstd-compressed full report to Redis for downloads.
+    
+    Status polls get their preview from the task result, so only the full
+    report is stored here.
+    """
+    try:
+        redis_client.setex(f"report:{session_id}:full", REPORT_TTL, zstd_compressor.compress(report.encode('utf-8')))
+    except Exception as e:
+        logger.error(f"Error saving report blobs: {e}")
+
+
+def pack_transcript(text: str) -> bytes:
+    """Compress a transcript for storage in Redis."""
+    return zstd_compressor.compress(text.encode('utf-8'))
+
+
+def unpack_transcript(data: bytes) -> str:
+    """Decode a stored transcript, accepting both compressed and plain UTF-8 values."""
+    if data.startswith(ZSTD_FRAME_MAGIC):
+        data = zstd_decompressor.decompress(data)
+    return data.decode('utf-8')
+
+
+def load_cluster_meta(session_id: str) -> Dict[str, Any]:
+    """Load cluster metadata, without transcripts, from Redis."""
     try:
         data = redis_client.get(f"cluster:{session_id}")
         if data:
-            return json.loads(data)
+            return orjson.loads(data)
         return None
     except Exception as e:
         logger.error(f"Error loading cluster state: {e}")
         return None
 
 
+def load_cluster_state(session_id: str) -> Dict[str, Any]:
+    """Load cluster state, including its transcripts, from Redis."""
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(f"cluster:{session_id}")
+        for key in CLUSTER_TRANSCRIPT_KEYS.values():
+            pipe.hgetall(key.format(session_id=session_id))
+        data, transcripts, cleaned_transcripts = pipe.execute()
+        if not data:
+            return None
+        
+        state = orjson.loads(data)
+        state['transcripts'] = {k.decode(): unpack_transcript(v) for k, v in transcripts.items()}
+        state['cleaned_transcripts'] = {k.decode(): unpack_transcript(v) for k, v in cleaned_transcripts.items()}
+        return state
+    except Exception as e:
+        logger.error(f"Error loading cluster state: {e}")
+        return None
+
+
+def load_synthesis_input(session_id: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Load cluster metadata and the transcript to synthesize from for each video.
+    
+    The cleaned transcript is preferred over the original, and only the chosen
+    one is decompressed. Returns (None, {}) if the cluster is missing.
+    """
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(f"cluster:{session_id}")
+        for key in CLUSTER_TRANSCRIPT_KEYS.values():
+            pipe.hgetall(key.format(session_id=session_id))
+        data, transcripts, cleaned_transcripts = pipe.execute()
+        if not data:
+            return None, {}
+        
+        return orjson.loads(data), {
+            video_id.decode(): unpack_transcript(cleaned_transcripts.get(video_id, transcript))
+            for video_id, transcript in transcripts.items()
+        }
+    except Exception as e:
+        logger.error(f"Error loading cluster state: {e}")
+        return None, {}
+
+
+def cache_single_summary(result: Dict[str, Any], model: str) -> None:
+    """Cache a finished summary, without its transcript, for repeat requests."""
+    try:
+        cached = {key: value for key, value in result.items() if key != 'transcript'}
+        redis_client.setex(
+            summary_cache_key(result['video_id'], result['cleaned'], model),
+            SUMMARY_CACHE_TTL,
+            orjson.dumps(cached)
+        )
+    except Exception as e:
+        logger.error(f"Error caching single summary: {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def get_output_dir() -> str:
+    """Get the output directory, creating it on first use in this process."""
+    output_dir = env_settings().output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    return output_dir
+
+
+def write_output_files(files: List[Tuple[str, str]]) -> None:
+    """Write (path, content) pairs in parallel, raising the first write error."""
+    for _ in _file_writer.map(lambda item: Path(item[0]).write_text(item[1], encoding='utf-8'), files):
+        pass
+
+
 def save_single_video_result(result: Dict[str, Any]) -> None:
     """Save single video result to output directory."""
     try:
-        output_dir = os.getenv('OUTPUT_DIR', './output')
-        os.makedirs(output_dir, exist_ok=True)
+        output_dir = get_output_dir()
         
         video_id = result['video_id']
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Save transcript
-        transcript_filename = f"{output_dir}/{video_id}_transcript_{timestamp}.md"
-        with open(transcript_filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Transcript: {video_id}\n\n")
-            f.write(f"**Generated:** {datetime.now().isoformat()}\n")
-            f.write(f"**Word Count:** {result['word_count']}\n")
-            f.write(f"**Character Count:** {result['character_count']}\n")
-            f.write(f"**Cleaned:** {result['cleaned']}\n\n")
-            f.write("## Transcript\n\n")
-            f.write(result['transcript'])
-        
-        # Save summary
-        summary_filename = f"{output_dir}/{video_id}_summary_{timestamp}.md"
-        with open(summary_filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Summary: {video_id}\n\n")
-            f.write(f"**Generated:** {datetime.now().isoformat()}\n")
-            f.write(f"**Model:** {result.get('model', 'Unknown')}\n\n")
-            f.write("## Summary\n\n")
-            f.write(result['summary'])
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        generated = now.isoformat()
+        
+        # Save transcript and summary concurrently
+        write_output_files([(
+            f"{output_dir}/{video_id}_transcript_{timestamp}.md",
+            f"# Transcript: {video_id}\n\n"
+            f"**Generated:** {generated}\n"
+            f"**Word Count:** {result['word_count']}\n"
+            f"**Character Count:** {result['character_count']}\n"
+            f"**Cleaned:** {result['cleaned']}\n\n"
+            f"## Transcript\n\n"
+            f"{result['transcript']}"
+        ), (
+            f"{output_dir}/{video_id}_summary_{timestamp}.md",
+            f"# Summary: {video_id}\n\n"
+            f"**Generated:** {generated}\n"
+            f"**Model:** {result.get('model', 'Unknown')}\n\n"
+            f"## Summary\n\n"
+            f"{result['summary']}"
+        )])
         
         logger.info(f"Saved results for video {video_id}")
         
@@ -323,28 +648,26 @@ def save_single_video_result(result: Dict[str, Any]) -> None:
         logger.error(f"Error saving single video result: {e}")
 
 
-def save_cluster_report(session_id: str, cluster_state: Dict[str, Any]) -> None:
+def save_cluster_report(session_id: str, cluster_name: str, report: str, video_count: int) -> None:
     """Save cluster report to output directory."""
     try:
-        output_dir = os.getenv('OUTPUT_DIR', './output')
-        os.makedirs(output_dir, exist_ok=True)
+        output_dir = get_output_dir()
         
-        cluster_name = cluster_state['name']
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
         
         # Create sanitized filename
-        safe_name = "".join(c for c in cluster_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_name = safe_name.replace(' ', '_')
-        
-        filename = f"{output_dir}/{safe_name}_cluster_report_{timestamp}.md"
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Research Report: {cluster_name}\n\n")
-            f.write(f"**Generated:** {datetime.now().isoformat()}\n")
-            f.write(f"**Session ID:** {session_id}\n")
-            f.write(f"**Videos Processed:** {len(cluster_state['transcripts'])}\n\n")
-            f.write("---\n\n")
-            f.write(cluster_state['summary'])
+        safe_name = _UNSAFE_FILENAME_CHARS.sub('', cluster_name).rstrip().replace(' ', '_')
+        
+        Path(f"{output_dir}/{safe_name}_cluster_report_{timestamp}.md").write_text(
+            f"# Research Report: {cluster_name}\n\n"
+            f"**Generated:** {now.isoformat()}\n"
+            f"**Session ID:** {session_id}\n"
+            f"**Videos Processed:** {video_count}\n\n"
+            f"---\n\n"
+            f"{report}",
+            encoding='utf-8'
+        )
         
         logger.info(f"Saved cluster report for {cluster_name}")
         
@@ -352,15 +675,32 @@ def save_cluster_report(session_id: str, cluster_state: Dict[str, Any]) -> None:
         logger.error(f"Error saving cluster report: {e}")
 
 
-def get_all_clusters() -> List[Dict[str, Any]]:
+def get_all_clusters() -> List[ClusterState]:
     """Get all active clusters from Redis."""
     try:
+        keys = list(redis_client.scan_iter("cluster:*", count=CLUSTER_SCAN_BATCH))
+        if not keys:
+            return []
+        
+        # Fetch clusters with one MGET per batch instead of one GET per key, keeping
+        # each command small, and validate the JSON documents as one array
+        rows = []
+        for start in range(0, len(keys), CLUSTER_SCAN_BATCH):
+            batch = keys[start:start + CLUSTER_SCAN_BATCH]
+            rows.extend((key, data) for key, data in zip(batch, redis_client.mget(batch)) if data)
+        
+        try:
+            return CLUSTER_LIST_ADAPTER.validate_json(b'[' + b','.join(data for _, data in rows) + b']')
+        except ValidationError:
+            pass
+        
+        # Some document is malformed or from an old schema; validate row by row and skip it
         clusters = []
-        for key in redis_client.scan_iter("cluster:*"):
-            session_id = key.decode('utf-8').split(':', 1)[1]
-            state = load_cluster_state(session_id)
-            if state:
-                clusters.append(state)
+        for key, data in rows:
+            try:
+                clusters.append(ClusterState.model_validate_json(data))
+            except ValidationError as e:
+                logger.warning(f"Skipping invalid cluster {key.decode()}: {e}")
         return clusters
     except Exception as e:
         logger.error(f"Error getting all clusters: {e}")